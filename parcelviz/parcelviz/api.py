@@ -3,30 +3,57 @@
 from __future__ import annotations
 
 import logging
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
+from typing import AsyncIterator
 
-from fastapi import Depends, FastAPI, HTTPException
+import httpx
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
+from .http import async_http_client
 from .models import RenderRequest, RenderResponse
 from .pipeline import PipelineError, RenderPipeline
-from .settings import AppSettings, get_settings
+from .settings import get_settings
 
 LOGGER = logging.getLogger(__name__)
 WEB_DIR = Path(__file__).resolve().parent / "web"
 OUTPUT_DIR = get_settings().output_root
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-app = FastAPI(title="ParcelViz API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Build the shared pipeline (config, HTTP cache, adapters) and layer-fetch client before serving requests."""
+
+    app.state.pipeline = await run_in_threadpool(RenderPipeline, settings=get_settings())
+    # One client for the process so keep-alive and HTTP/2 connections are reused across renders.
+    try:
+        async with async_http_client() as client:
+            app.state.http_client = client
+            yield
+    finally:
+        app.state.pipeline.close()
+
+
+app = FastAPI(title="ParcelViz API", version="0.1.0", lifespan=lifespan)
 app.mount("/static", StaticFiles(directory=WEB_DIR), name="static")
 app.mount("/outputs", StaticFiles(directory=OUTPUT_DIR, html=False), name="outputs")
 
 
-def get_pipeline(settings: AppSettings = Depends(get_settings)) -> RenderPipeline:
-    """Provide a RenderPipeline instance for FastAPI dependency injection."""
+async def get_pipeline(request: Request) -> RenderPipeline:
+    """Provide the shared RenderPipeline instance for FastAPI dependency injection."""
+
+    return request.app.state.pipeline
 
-    return RenderPipeline(settings=settings)
+
+async def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Provide the shared async client used for layer fetches."""
+
+    return request.app.state.http_client
 
 
 @app.get("/health")
@@ -40,18 +67,28 @@ async def health() -> dict:
 async def index() -> HTMLResponse:
     """Serve the simple front-end."""
 
+    return HTMLResponse(content=_index_html())
+
+
+@lru_cache(maxsize=1)
+def _index_html() -> str:
+    """Return index.html rewritten to reference the mounted static assets."""
+
     html = (WEB_DIR / "index.html").read_text(encoding="utf-8")
     html = html.replace('href="styles.css"', 'href="/static/styles.css"')
-    html = html.replace('src="main.js"', 'src="/static/main.js"')
-    return HTMLResponse(content=html)
+    return html.replace('src="main.js"', 'src="/static/main.js"')
 
 
 @app.post("/render", response_model=RenderResponse)
-async def render(request: RenderRequest, pipeline: RenderPipeline = Depends(get_pipeline)) -> RenderResponse:
+async def render(
+    request: RenderRequest,
+    pipeline: RenderPipeline = Depends(get_pipeline),
+    client: httpx.AsyncClient = Depends(get_http_client),
+) -> RenderResponse:
     """Render layers for a parcel."""
 
     try:
-        return pipeline.run(request)
+        return await pipeline.run_async(request, client=client)
     except PipelineError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:  # pylint: disable=broad-except
@@ -2,18 +2,325 @@
 
 from __future__ import annotations
 
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import requests_cache
 
+from .settings import get_settings
+from .utils import ensure_directory, retry_missing_directory
 
-def configure_requests_cache(path: Path, expire_hours: Optional[int] = None, backend: str = "sqlite") -> None:
-    """Configure global requests-cache."""
+# SQLite tuning so concurrent fetches do not hit "database is locked" or block on commits.
+_SQLITE_OPTIONS: Dict[str, Any] = {"wal": True, "fast_save": True, "timeout": 5.0}
+
+_installed: Optional[Dict[str, Any]] = None
+
+
+def cache_options(path: Path, expire_hours: Optional[int] = None, backend: str = "sqlite") -> Dict[str, Any]:
+    """Return CachedSession keyword arguments for a cache location.
+
+    Responses honour Cache-Control/ETag headers, so expired entries are revalidated
+    with conditional requests, and stale entries are served if revalidation fails.
+    """
+
+    options: Dict[str, Any] = {
+        "cache_name": str(path.with_suffix("")),
+        "backend": backend,
+        "expire_after": None if expire_hours is None else expire_hours * 3600,
+        "cache_control": True,
+        "stale_if_error": True,
+        "allowable_methods": ("GET",),
+    }
+    if backend == "sqlite":
+        options.update(_SQLITE_OPTIONS)
+    return options
+
+
+def configure_requests_cache(
+    path: Path, expire_hours: Optional[int] = None, backend: str = "sqlite"
+) -> Dict[str, Any]:
+    """Configure global requests-cache and return the options it was installed with.
+
+    Use ``backend="filesystem"`` when responses are large binary payloads (e.g. WMS
+    imagery); each response is stored as its own file instead of a SQLite blob.
+    Repeated calls with the same settings leave the installed cache untouched.
+    """
+
+    global _installed
+
+    options = cache_options(path, expire_hours=expire_hours, backend=backend)
+    if options == _installed and requests_cache.is_installed():
+        return options
 
     path.parent.mkdir(parents=True, exist_ok=True)
-    requests_cache.install_cache(
-        cache_name=str(path.with_suffix("")),
-        backend=backend,
-        expire_after=None if expire_hours is None else expire_hours * 3600,
-    )
+    requests_cache.install_cache(**options)
+    _installed = options
+    return options
+
+
+def current_cache_options() -> Dict[str, Any]:
+    """Return the installed cache options, or the defaults for the settings' cache path.
+
+    A relative ``cache_path`` is resolved against the config directory, as the
+    pipeline does, so the result does not depend on the working directory.
+    """
+
+    if _installed is not None:
+        return _installed
+    settings = get_settings()
+    path = settings.cache_path
+    if not path.is_absolute():
+        path = settings.config_path.parent / path
+    return cache_options(path)
+
+
+def cached_session(options: Optional[Mapping[str, Any]] = None) -> requests_cache.CachedSession:
+    """Return a new session backed by ``options`` (defaults to `current_cache_options`)."""
+
+    options = dict(options) if options is not None else current_cache_options()
+    Path(options["cache_name"]).parent.mkdir(parents=True, exist_ok=True)
+    return requests_cache.CachedSession(**options)
+
+
+def response_freshness(headers: Mapping[str, str], now: Optional[float] = None) -> Tuple[bool, Optional[float]]:
+    """Return whether a response may be stored and the time it goes stale.
+
+    Follows the ``cache_control=True`` policy of the sync session: ``no-store`` is
+    never stored, ``no-cache`` is stored but always revalidated, and ``max-age``
+    takes precedence over ``Expires``. ``None`` means neither header was sent and
+    the cache's ``expire_hours`` applies.
+    """
+
+    now = time.time() if now is None else now
+    directives: Dict[str, str] = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip().strip('"')
+    if "no-store" in directives:
+        return False, None
+    if "no-cache" in directives:
+        return True, now
+    if "max-age" in directives:
+        try:
+            return True, now + int(directives["max-age"])
+        except ValueError:
+            return True, now
+    expires = headers.get("Expires")
+    if expires is None:
+        return True, None
+    try:
+        parsed = parsedate_to_datetime(expires)
+    except (TypeError, ValueError):
+        # An invalid Expires value (often "0" or "-1") means already expired.
+        return True, now
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return True, parsed.timestamp()
+
+
+class ImageFileCache:
+    """Size-capped, least-recently-used on-disk store for image payloads.
+
+    Entries are written to a temporary file and renamed into place, so concurrent
+    renders never read a half-written image. Access times are set explicitly on
+    reads, keeping eviction LRU even on ``noatime`` mounts.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: Optional[int] = None,
+        expire_hours: Optional[int] = None,
+        suffix: str = ".png",
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.expire_seconds = None if expire_hours is None else expire_hours * 3600
+        self.suffix = suffix
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached payload for ``key``, or None if missing or expired."""
+
+        content, fresh = self.lookup(key)
+        return content if fresh else None
+
+    def lookup(self, key: str) -> Tuple[Optional[bytes], bool]:
+        """Return the payload for ``key`` (even if expired) and whether it is still fresh."""
+
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            content = path.read_bytes()
+            os.utime(path, (time.time(), stat.st_mtime))
+        except FileNotFoundError:
+            return None, False
+        fresh = self.expire_seconds is None or time.time() - stat.st_mtime <= self.expire_seconds
+        return content, fresh
+
+    def touch(self, key: str) -> bool:
+        """Mark ``key`` as fresh and recently used without rewriting it; False if it is gone."""
+
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, key: str, content: bytes) -> None:
+        """Store ``content`` under ``key`` and evict old entries beyond the size cap."""
+
+        ensure_directory(self.directory)
+        retry_missing_directory(self.directory, partial(self._write, key, content))
+        if self.max_bytes is not None:
+            self._evict()
+
+    def _write(self, key: str, content: bytes) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(content)
+            os.replace(tmp_name, self._path(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(self.suffix):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class ResponseCache:
+    """Response bodies and ETag/Last-Modified validators for async layer fetches.
+
+    httpx requests bypass requests-cache, so this table stands in for it: an entry
+    is fresh until the ``expires_at`` time derived from its Cache-Control/Expires
+    headers, or for ``expire_hours`` when the server sent neither. Stale entries are
+    revalidated with conditional requests when the server sent validators and
+    dropped otherwise. Entries live in their own table of the HTTP cache's SQLite
+    file; the least recently used are evicted once stored bodies exceed
+    ``max_bytes``. Validators can be stored without a body when the caller keeps
+    the payload elsewhere (e.g. WMS images in `ImageFileCache`).
+    """
+
+    def __init__(self, path: Path, max_bytes: Optional[int] = None, expire_hours: Optional[int] = None) -> None:
+        ensure_directory(path.parent)
+        self.max_bytes = max_bytes
+        self.expire_seconds = None if expire_hours is None else expire_hours * 3600
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(path), timeout=_SQLITE_OPTIONS["timeout"], isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS layer_responses ("
+                " key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content BLOB, size INTEGER NOT NULL,"
+                " stored_at REAL NOT NULL, accessed_at REAL NOT NULL, expires_at REAL)"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(layer_responses)")}
+            if "expires_at" not in columns:
+                self._db.execute("ALTER TABLE layer_responses ADD COLUMN expires_at REAL")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the ``etag``/``last_modified``/``content``/``fresh`` entry for ``key``."""
+
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, content, stored_at, expires_at FROM layer_responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            etag, last_modified, content, stored_at, expires_at = row
+            if expires_at is not None:
+                fresh = now < expires_at
+            else:
+                fresh = self.expire_seconds is None or now - stored_at <= self.expire_seconds
+            if not fresh and etag is None and last_modified is None:
+                self._db.execute("DELETE FROM layer_responses WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE layer_responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return {"etag": etag, "last_modified": last_modified, "content": content, "fresh": fresh}
+
+    def put(
+        self,
+        key: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content: Optional[bytes],
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """Store a response (or only its validators) for ``key``, then enforce the age and size limits.
+
+        ``expires_at`` comes from the response's caching headers; without it the
+        entry is fresh for ``expire_hours``.
+        """
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO layer_responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, content, len(content or b""), now, now, expires_at),
+            )
+            self._evict(now)
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+
+        with self._lock:
+            self._db.close()
+
+    def delete(self, key: str) -> None:
+        """Forget the entry for ``key``."""
+
+        with self._lock:
+            self._db.execute("DELETE FROM layer_responses WHERE key = ?", (key,))
+
+    def _evict(self, now: float) -> None:
+        # Expired entries are only worth keeping if they can be revalidated.
+        if self.expire_seconds is None:
+            expired, params = "expires_at <= ?", (now,)
+        else:
+            expired, params = "COALESCE(expires_at, stored_at + ?) <= ?", (self.expire_seconds, now)
+        self._db.execute(
+            f"DELETE FROM layer_responses WHERE etag IS NULL AND last_modified IS NULL AND {expired}", params
+        )
+        if self.max_bytes is not None:
+            # Keep the most recently used entries whose cumulative size fits under the cap.
+            self._db.execute(
+                "DELETE FROM layer_responses WHERE key IN ("
+                " SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS running"
+                " FROM layer_responses) WHERE running > ?)",
+                (self.max_bytes,),
+            )
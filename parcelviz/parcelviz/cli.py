@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import importlib.util
 import json
 import logging
 from typing import List, Optional
@@ -10,6 +11,7 @@ import typer
 
 from .models import RenderRequest
 from .pipeline import PipelineError, RenderPipeline
+from .settings import get_settings
 
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 
@@ -41,6 +43,26 @@ def render(
     typer.echo(json.dumps(response.model_dump(), indent=2, default=str))
 
 
+@app.command()
+def serve() -> None:
+    """Serve the API with uvicorn, using uvloop and httptools when they are installed."""
+
+    import uvicorn
+
+    settings = get_settings()
+    uvicorn.run(
+        "parcelviz.api:app",
+        host=settings.api_host,
+        port=settings.api_port,
+        reload=settings.api_reload,
+        workers=None if settings.api_reload else settings.api_workers,
+        # uvloop is not available on Windows; let uvicorn pick its default loop/parser there.
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "auto",
+        http="httptools" if importlib.util.find_spec("httptools") else "auto",
+        log_level=settings.log_level.lower(),
+    )
+
+
 def main() -> None:
     """Entrypoint for python -m parcelviz."""
 
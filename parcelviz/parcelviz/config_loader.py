@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
-import json
+import pickle
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, Mapping, MutableMapping
+from typing import Any, Dict, Iterable, Iterator, Mapping, MutableMapping, Tuple
 
 import yaml
 
 from .models import LayerConfig
 
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ConfigError(RuntimeError):
     """Raised when the configuration file is invalid."""
@@ -20,10 +24,22 @@ class SourceConfig:
 
     def __init__(self, raw: Mapping[str, Any]) -> None:
         self._raw = dict(raw)
+        # Sections read on every pipeline construction are resolved once up front.
+        self._default_crs = int(self._raw.get("default_crs", 4326))
+        self._cache: Mapping[str, Any] = self._raw.get("cache", {})
+        self._map_spec: Mapping[str, Any] = self._raw.get(
+            "map",
+            {
+                "width_px": 1600,
+                "height_px": 1200,
+                "dpi": 220,
+            },
+        )
+        self._layers: Dict[str, LayerConfig] = dict(self._parse_layers())
 
     @property
     def default_crs(self) -> int:
-        return int(self._raw.get("default_crs", 4326))
+        return self._default_crs
 
     @property
     def buffer_feet(self) -> float:
@@ -31,18 +47,11 @@ class SourceConfig:
 
     @property
     def cache(self) -> Mapping[str, Any]:
-        return self._raw.get("cache", {})
+        return self._cache
 
     @property
     def map_spec(self) -> Mapping[str, Any]:
-        return self._raw.get(
-            "map",
-            {
-                "width_px": 1600,
-                "height_px": 1200,
-                "dpi": 220,
-            },
-        )
+        return self._map_spec
 
     @property
     def parcels(self) -> Mapping[str, Any]:
@@ -53,35 +62,46 @@ class SourceConfig:
 
     @property
     def layers(self) -> Iterable[LayerConfig]:
+        return self._layers.values()
+
+    def get_layer(self, name: str) -> LayerConfig:
+        try:
+            return self._layers[name]
+        except KeyError as exc:
+            raise ConfigError(f"Layer '{name}' not defined in configuration.") from exc
+
+    def to_dict(self) -> Dict[str, Any]:
+        # A pickle round-trip deep-copies plain YAML data faster than copy.deepcopy.
+        return pickle.loads(pickle.dumps(self._raw, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _parse_layers(self) -> Iterator[Tuple[str, LayerConfig]]:
         layers = self._raw.get("layers", {})
         for name, params in layers.items():
             if "type" not in params:
                 raise ConfigError(f"Layer '{name}' missing 'type'.")
             target_epsg = int(params.get("target_epsg", self.default_crs))
-            yield LayerConfig(
+            yield name, LayerConfig(
                 name=name,
                 type=str(params["type"]),
                 target_epsg=target_epsg,
                 params={k: v for k, v in params.items() if k not in ("type", "target_epsg")},
             )
 
-    def get_layer(self, name: str) -> LayerConfig:
-        for layer in self.layers:
-            if layer.name == name:
-                return layer
-        raise ConfigError(f"Layer '{name}' not defined in configuration.")
-
-    def to_dict(self) -> Dict[str, Any]:
-        return json.loads(json.dumps(self._raw))
-
 
 def load_source_config(path: Path) -> SourceConfig:
     """Load configuration file and return a `SourceConfig` instance."""
 
     if not path.exists():
         raise ConfigError(f"Configuration file not found: {path}")
+    return _load_source_config(path, path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=16)
+def _load_source_config(path: Path, mtime_ns: int) -> SourceConfig:
+    """Parse a configuration file; cached per path and modification time."""
+
     with path.open("r", encoding="utf-8") as fp:
-        data = yaml.safe_load(fp) or {}
+        data = yaml.load(fp, Loader=_YAML_LOADER) or {}
     if not isinstance(data, MutableMapping):
         raise ConfigError("Configuration root must be a mapping.")
     return SourceConfig(data)
@@ -3,12 +3,35 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Tuple
+from functools import lru_cache
+from typing import Dict, Sequence, Tuple
 
 import geopandas as gpd
+import numpy as np
+import shapely
 from pyproj import CRS, Transformer
 from shapely.geometry.base import BaseGeometry
 
+# Axis units (as reported by pyproj) for commonly used EPSG codes. Lets hot paths
+# skip CRS construction; codes not listed fall back to pyproj.
+_EPSG_UNITS: Dict[int, str] = {
+    4326: "degree",
+    4269: "degree",
+    4267: "degree",
+    3857: "metre",
+    3395: "metre",
+    5070: "metre",
+    **{code: "metre" for code in range(26910, 26920)},  # NAD83 / UTM zones 10N-19N
+    **{code: "metre" for code in range(32610, 32620)},  # WGS 84 / UTM zones 10N-19N
+    2227: "us survey foot",
+    2229: "us survey foot",
+    2236: "us survey foot",
+    2263: "us survey foot",
+    2264: "us survey foot",
+    2277: "us survey foot",
+    2278: "us survey foot",
+}
+
 
 @dataclass(frozen=True)
 class CRSInfo:
@@ -19,10 +42,24 @@ class CRSInfo:
     units: str
 
 
+@lru_cache(maxsize=128)
+def _cached_crs(epsg: int) -> CRS:
+    """Return a shared CRS instance for an EPSG code."""
+
+    return CRS.from_epsg(epsg)
+
+
+@lru_cache(maxsize=128)
+def _cached_transformer(src_epsg: int, dst_epsg: int) -> Transformer:
+    """Return a shared always_xy transformer for a CRS pair."""
+
+    return Transformer.from_crs(src_epsg, dst_epsg, always_xy=True)
+
+
 def describe_crs(epsg: int) -> CRSInfo:
     """Return human-readable CRS metadata."""
 
-    crs = CRS.from_epsg(epsg)
+    crs = _cached_crs(epsg)
     return CRSInfo(epsg=epsg, name=crs.name, units=crs.axis_info[0].unit_name)
 
 
@@ -31,8 +68,20 @@ def reproject_geometry(geometry: BaseGeometry, src_epsg: int, dst_epsg: int) ->
 
     if src_epsg == dst_epsg:
         return geometry
-    transformer = Transformer.from_crs(src_epsg, dst_epsg, always_xy=True)
-    return shapely_transform(transformer.transform, geometry)
+    transformer = _cached_transformer(src_epsg, dst_epsg)
+    if geometry.has_z:
+        return shapely_transform(transformer.transform, geometry)
+    return _transform_coordinates(transformer, geometry)
+
+
+def _transform_coordinates(transformer: Transformer, geometry: BaseGeometry) -> BaseGeometry:
+    """Transform all 2D coordinates of a geometry in a single vectorized call."""
+
+    coords = shapely.get_coordinates(geometry)
+    if not len(coords):
+        return geometry
+    xs, ys = transformer.transform(coords[:, 0], coords[:, 1])
+    return shapely.set_coordinates(geometry, np.column_stack([xs, ys]))
 
 
 def shapely_transform(func, geometry: BaseGeometry) -> BaseGeometry:
@@ -47,11 +96,14 @@ def shapely_transform(func, geometry: BaseGeometry) -> BaseGeometry:
 def reproject_gdf(gdf: gpd.GeoDataFrame, dst_epsg: int) -> gpd.GeoDataFrame:
     """Reproject a GeoDataFrame to a different CRS."""
 
-    if gdf.crs is None:
+    src = gdf.crs
+    if src is None:
         raise ValueError("GeoDataFrame CRS is undefined.")
-    if int(gdf.crs.to_epsg()) == dst_epsg:
+    # Compare against the cached target CRS instead of resolving an EPSG code via proj.db.
+    target = _cached_crs(dst_epsg)
+    if src is target or src.equals(target):
         return gdf
-    return gdf.to_crs(epsg=dst_epsg)
+    return gdf.to_crs(target)
 
 
 def buffer_extent(bounds: Tuple[float, float, float, float], buffer_distance: float) -> Tuple[float, float, float, float]:
@@ -64,8 +116,9 @@ def buffer_extent(bounds: Tuple[float, float, float, float], buffer_distance: fl
 def feet_to_crs_units(buffer_feet: float, epsg: int) -> float:
     """Convert a distance in feet to the units of the provided CRS."""
 
-    crs = CRS.from_epsg(epsg)
-    unit_name = crs.axis_info[0].unit_name.lower()
+    unit_name = _EPSG_UNITS.get(epsg)
+    if unit_name is None:
+        unit_name = _cached_crs(epsg).axis_info[0].unit_name.lower()
     if "metre" in unit_name:
         return buffer_feet * 0.3048
     if "foot" in unit_name or "feet" in unit_name:
@@ -86,5 +139,38 @@ def buffered_geometry_bounds(
 
     projected_geom = reproject_geometry(geometry, src_epsg, dst_epsg)
     buffer_distance = feet_to_crs_units(buffer_feet, dst_epsg)
-    buffered = projected_geom.buffer(buffer_distance)
-    return projected_geom, buffered.bounds
+    # The bounds of a round buffer are the geometry bounds grown by the distance.
+    return projected_geom, buffer_extent(projected_geom.bounds, buffer_distance)
+
+
+def buffered_geometry_bounds_batch(
+    geometries: Sequence[BaseGeometry],
+    src_epsg: int,
+    dst_epsg: int,
+    buffer_feet: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized `buffered_geometry_bounds` for many parcels sharing a CRS pair.
+
+    All 2D vertices are reprojected in one transformer call and written back with
+    ``shapely.set_coordinates``, so holes and multipart geometries keep their
+    structure. Returns the projected geometries and an ``(n, 4)`` bounds array.
+    """
+
+    geoms = np.array(geometries, dtype=object)
+    if src_epsg != dst_epsg and len(geoms):
+        transformer = _cached_transformer(src_epsg, dst_epsg)
+        has_z = shapely.has_z(geoms)
+        flat = geoms[~has_z]
+        coords = shapely.get_coordinates(flat)
+        if len(coords):
+            xs, ys = transformer.transform(coords[:, 0], coords[:, 1])
+            # Boolean indexing copied the array, so the caller's sequence is left untouched.
+            geoms[~has_z] = shapely.set_coordinates(flat, np.column_stack([xs, ys]))
+        for index in np.flatnonzero(has_z):
+            geoms[index] = shapely_transform(transformer.transform, geoms[index])
+
+    buffer_distance = feet_to_crs_units(buffer_feet, dst_epsg)
+    bounds = shapely.bounds(geoms)
+    bounds[:, :2] -= buffer_distance
+    bounds[:, 2:] += buffer_distance
+    return geoms, bounds
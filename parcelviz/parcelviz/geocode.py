@@ -5,8 +5,9 @@ from __future__ import annotations
 import logging
 from typing import Dict, Optional
 
+import orjson
 import requests
-from shapely.geometry import shape
+import shapely
 
 from .models import ParcelRecord
 
@@ -31,13 +32,13 @@ class LightBoxClient:
         search_payload = {"address": address, "limit": 1}
         response = self.session.post(f"{self.base_url}/geocode", json=search_payload, timeout=20)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         if not data.get("results"):
             raise GeocodeError(f"No results returned for address: {address}")
         candidate = data["results"][0]
 
         parcel_info = self._lookup_parcel(candidate["parcelId"])
-        geometry = shape(parcel_info["geometry"])
+        geometry = shapely.from_geojson(orjson.dumps(parcel_info["geometry"]))
         return ParcelRecord(
             apn=parcel_info.get("apn", candidate.get("parcelId", "")),
             address=parcel_info.get("siteAddress", address),
@@ -49,7 +50,7 @@ class LightBoxClient:
     def _lookup_parcel(self, parcel_id: str) -> Dict[str, object]:
         response = self.session.get(f"{self.base_url}/parcels/{parcel_id}", timeout=20)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
 
 class GeocodeService:
@@ -0,0 +1,132 @@
+"""Shared HTTP clients."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, TypeVar
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import ResponseCache, cached_session, current_cache_options, response_freshness
+from .settings import get_settings
+from .utils import extent_hash
+
+# HTTP/2 needs the optional ``h2`` package (``httpx[http2]``); without it httpx speaks HTTP/1.1.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+T = TypeVar("T")
+
+
+def get_http_session(options: Optional[Mapping[str, Any]] = None) -> requests.Session:
+    """Return the session shared by parcel services and layer adapters for a cache.
+
+    ``options`` are ``cache_options`` keyword arguments (the pipeline passes the ones
+    it resolved from its config); without them the installed cache is used. One
+    session is kept per distinct set of options, so pipelines with different caches
+    never share one. Its connection pool is sized for the render worker count.
+    """
+
+    options = options if options is not None else current_cache_options()
+    return _session_for(tuple(sorted(options.items())))
+
+
+@lru_cache(maxsize=8)
+def _session_for(options: Tuple[Tuple[str, Any], ...]) -> requests.Session:
+    render_workers = get_settings().render_workers
+    session = cached_session(dict(options))
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=max(16, render_workers * 2),
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def async_http_client() -> httpx.AsyncClient:
+    """Return a new async client for a render's concurrent layer fetches.
+
+    Layers that share a host (typically one ArcGIS server) are multiplexed over a
+    single HTTP/2 connection. Async clients are bound to the event loop they are
+    used on, so each render opens its own rather than sharing a process singleton.
+    """
+
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+    )
+
+
+async def cached_get(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Mapping[str, object],
+    parse: Callable[[bytes], T],
+    cache: Optional[ResponseCache] = None,
+    timeout: float = 30,
+    *,
+    store_body: bool = True,
+    stale_body: Optional[bytes] = None,
+) -> T:
+    """GET ``url`` through ``cache`` and return ``parse(body)``.
+
+    ``parse`` is the adapter's validation (it runs in a worker thread and raises on
+    error payloads); a response is only stored once it succeeds. Fresh cached bodies
+    are returned without a request; stale ones are revalidated with their
+    ETag/Last-Modified values. When the caller keeps payloads itself it passes
+    ``store_body=False`` (only validators are stored) and its copy as ``stale_body``
+    for a 304 response.
+    """
+
+    if cache is None:
+        response = await client.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return await asyncio.to_thread(parse, response.content)
+
+    key = extent_hash({"url": url, **params})
+    # SQLite reads and writes block; keep them off the event loop.
+    entry = await asyncio.to_thread(cache.get, key)
+    if entry is not None and entry["fresh"] and entry["content"] is not None:
+        try:
+            return await asyncio.to_thread(parse, entry["content"])
+        except Exception:
+            # A stored body that no longer validates is dropped and fetched again.
+            await asyncio.to_thread(cache.delete, key)
+            entry = None
+
+    body = entry["content"] if entry is not None and entry["content"] is not None else stale_body
+    headers: Dict[str, str] = {}
+    # Only revalidate when a 304 could be answered with a body.
+    if entry is not None and body is not None:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = await client.get(url, params=params, headers=headers, timeout=timeout)
+    not_modified = response.status_code == 304 and bool(headers)
+    if not not_modified:
+        response.raise_for_status()
+        body = response.content
+    try:
+        value = await asyncio.to_thread(parse, body)
+    except Exception:
+        if not_modified:
+            # Never keep replaying a stored body on 304s once it fails validation.
+            await asyncio.to_thread(cache.delete, key)
+        raise
+
+    storable, expires_at = response_freshness(response.headers)
+    etag = response.headers.get("ETag") or (entry["etag"] if not_modified else None)
+    last_modified = response.headers.get("Last-Modified") or (entry["last_modified"] if not_modified else None)
+    if storable and (store_body or etag or last_modified):
+        await asyncio.to_thread(cache.put, key, etag, last_modified, body if store_body else None, expires_at)
+    return value
+
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import geopandas as gpd
+import httpx
+import orjson
 import requests
+import shapely
 
+from ..cache import ResponseCache
+from ..http import cached_get, get_http_session
 from ..models import LayerConfig
 
 LOGGER = logging.getLogger(__name__)
@@ -21,18 +26,83 @@ class ArcGISLayerError(RuntimeError):
 class ArcGISFeatureLayer:
     """Fetch GeoDataFrame data from ArcGIS FeatureServer services."""
 
-    def __init__(self, config: LayerConfig, token: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        config: LayerConfig,
+        token: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ) -> None:
         self.config = config
-        self.session = requests.Session()
+        self.session = session or get_http_session()
         self.token = token
+        self.response_cache = response_cache
         url = self.config.params.get("url")
         if not url:
             raise ArcGISLayerError(f"Layer '{self.config.name}' missing 'url' parameter.")
         self.url = url.rstrip("/")
+        self.page_size = int(self.config.params.get("page_size", 1000))
 
     def fetch(self, extent: Dict[str, float]) -> gpd.GeoDataFrame:
         """Query features intersecting the provided extent."""
 
+        response = self.session.get(f"{self.url}/query", params=self._query_params(extent), timeout=30)
+        response.raise_for_status()
+        payload = self._parse(response.content)
+        if self._exceeded_transfer_limit(payload):
+            LOGGER.warning("Layer '%s' hit the FeatureServer transfer limit; results are truncated.", self.config.name)
+        return self._to_frame(self._features(payload))
+
+    async def fetch_async(self, client: httpx.AsyncClient, extent: Dict[str, float]) -> gpd.GeoDataFrame:
+        """Query features intersecting the provided extent using a shared async client.
+
+        A single query, ordered by the layer's object-id field, covers most extents.
+        When the server reports ``exceededTransferLimit``, the rest of the result is
+        requested as concurrent ``resultOffset`` pages in the same order.
+        """
+
+        base = self._query_params(extent)
+        params = {**base, "orderByFields": await self._object_id_field_async(client)}
+        payload = await self._query_async(client, params)
+        features = self._features(payload)
+        if self._exceeded_transfer_limit(payload):
+            features = features + await self._fetch_remaining_pages(client, base, params, len(features))
+        # Geometry parsing is CPU-bound; keep it off the event loop.
+        return await asyncio.to_thread(self._to_frame, features)
+
+    async def _fetch_remaining_pages(
+        self, client: httpx.AsyncClient, base: Dict[str, object], params: Dict[str, object], returned: int
+    ) -> List[Dict[str, object]]:
+        total = await self._count_async(client, base)
+        # Never ask for more per page than the server just proved it will return.
+        page_size = min(self.page_size, returned) if returned else self.page_size
+        # The first reply used the same ordering, so it already holds the first ``returned`` records.
+        pages = [
+            {**params, "resultOffset": offset, "resultRecordCount": page_size}
+            for offset in range(returned, total, page_size)
+        ]
+        payloads = await asyncio.gather(*(self._query_async(client, page) for page in pages))
+        return [feature for payload in payloads for feature in self._features(payload)]
+
+    async def _count_async(self, client: httpx.AsyncClient, params: Dict[str, object]) -> int:
+        payload = await self._query_async(client, {**params, "f": "json", "returnCountOnly": "true"})
+        try:
+            return int(payload["count"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ArcGISLayerError("FeatureServer count response missing 'count'.") from exc
+
+    async def _object_id_field_async(self, client: httpx.AsyncClient) -> str:
+        configured = self.config.params.get("object_id_field")
+        if configured:
+            return configured
+        params: Dict[str, object] = {"f": "json"}
+        self._apply_token(params)
+        return await cached_get(client, self.url, params, self._parse_object_id_field, self.response_cache)
+
+    async def _query_async(self, client: httpx.AsyncClient, params: Dict[str, object]) -> Dict[str, object]:
+        return await cached_get(client, f"{self.url}/query", params, self._parse, self.response_cache)
+
+    def _query_params(self, extent: Dict[str, float]) -> Dict[str, object]:
         params = {
             "f": "geojson",
             "geometry": self._extent_to_arcgis(extent, self.config.target_epsg),
@@ -45,13 +115,48 @@ class ArcGISFeatureLayer:
             "returnGeometry": "true",
         }
         self._apply_token(params)
-        url = f"{self.url}/query"
-        response = self.session.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        payload = response.json()
+        return params
+
+    def _parse(self, content: bytes) -> Dict[str, object]:
+        try:
+            payload = orjson.loads(content)
+        except orjson.JSONDecodeError as exc:
+            raise ArcGISLayerError("FeatureServer returned invalid JSON.") from exc
+        # ArcGIS reports failures as 200 responses carrying an "error" object; these must not be cached.
+        if not isinstance(payload, dict):
+            raise ArcGISLayerError("FeatureServer response is not a JSON object.")
+        if "error" in payload:
+            error = payload["error"] if isinstance(payload["error"], dict) else {}
+            raise ArcGISLayerError(f"FeatureServer error: {error.get('message', payload['error'])}")
+        return payload
+
+    def _parse_object_id_field(self, content: bytes) -> str:
+        # Raising here keeps metadata without an object-id field out of the response cache.
+        metadata = self._parse(content)
+        field = metadata.get("objectIdField") or next(
+            (item["name"] for item in metadata.get("fields") or [] if item.get("type") == "esriFieldTypeOID"), None
+        )
+        if not field:
+            raise ArcGISLayerError(f"Layer '{self.config.name}' metadata missing 'objectIdField'.")
+        return field
+
+    def _exceeded_transfer_limit(self, payload: Dict[str, object]) -> bool:
+        # GeoJSON responses report the flag at the top level or under "properties".
+        properties = payload.get("properties") or {}
+        return bool(payload.get("exceededTransferLimit") or properties.get("exceededTransferLimit"))
+
+    def _features(self, payload: Dict[str, object]) -> List[Dict[str, object]]:
         if "features" not in payload:
             raise ArcGISLayerError("FeatureServer response missing 'features'.")
-        return gpd.GeoDataFrame.from_features(payload["features"], crs=f"EPSG:{self.config.target_epsg}")
+        return payload["features"]
+
+    def _to_frame(self, features: List[Dict[str, object]]) -> gpd.GeoDataFrame:
+        # Parse all geometries in one GEOS call instead of building shapes feature by feature.
+        geometries = shapely.from_geojson(
+            [None if feature.get("geometry") is None else orjson.dumps(feature["geometry"]) for feature in features]
+        )
+        properties = [feature.get("properties") or {} for feature in features]
+        return gpd.GeoDataFrame(properties, geometry=geometries, crs=f"EPSG:{self.config.target_epsg}")
 
     def _extent_to_arcgis(self, extent: Dict[str, float], srid: int) -> str:
         geometry = {
@@ -61,7 +166,7 @@ class ArcGISFeatureLayer:
             "ymax": extent["ymax"],
             "spatialReference": {"wkid": srid},
         }
-        return json.dumps(geometry)
+        return orjson.dumps(geometry, option=orjson.OPT_SERIALIZE_NUMPY).decode()
 
     def _apply_token(self, params: Dict[str, object]) -> None:
         if self.token:
@@ -2,17 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from functools import partial
 from io import BytesIO
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
+import httpx
 import requests
 from PIL import Image
 
+from ..cache import ImageFileCache, ResponseCache
+from ..http import cached_get, get_http_session
 from ..models import LayerConfig
+from ..utils import extent_hash
+
+try:  # Optional libvips-backed PNG decoder.
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
 
 LOGGER = logging.getLogger(__name__)
 
+# PIL raises OSError subclasses (UnidentifiedImageError) or ValueError on bad payloads.
+_DECODE_ERRORS = (OSError, ValueError) if pyvips is None else (OSError, ValueError, pyvips.Error)
+
 
 class WMSLayerError(RuntimeError):
     """Raised when WMS requests fail."""
@@ -21,9 +35,17 @@ class WMSLayerError(RuntimeError):
 class WMSLayer:
     """Fetch transparent PNG imagery from WMS/WMTS services."""
 
-    def __init__(self, config: LayerConfig) -> None:
+    def __init__(
+        self,
+        config: LayerConfig,
+        session: Optional[requests.Session] = None,
+        image_cache: Optional[ImageFileCache] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ) -> None:
         self.config = config
-        self.session = requests.Session()
+        self.session = session or get_http_session()
+        self.image_cache = image_cache
+        self.response_cache = response_cache
         url = self.config.params.get("url")
         if not url:
             raise WMSLayerError(f"Layer '{self.config.name}' missing 'url' parameter.")
@@ -32,7 +54,45 @@ class WMSLayer:
     def fetch(self, bbox: Dict[str, float], size: Tuple[int, int]) -> Image.Image:
         """Return an image for the requested bounding box."""
 
-        params = {
+        params = self._getmap_params(bbox, size)
+        key = self._cache_key(params)
+        content = self._cached(key)
+        if content is not None:
+            return self._decode(content)
+
+        response = self.session.get(self.url, params=params, timeout=30)
+        response.raise_for_status()
+        return self._decode_and_store(key, response.content)
+
+    async def fetch_async(
+        self, client: httpx.AsyncClient, bbox: Dict[str, float], size: Tuple[int, int]
+    ) -> Image.Image:
+        """Return an image for the requested bounding box using a shared async client."""
+
+        params = self._getmap_params(bbox, size)
+        key = self._cache_key(params)
+        # Image reads and PNG decoding are blocking/CPU-bound; keep them off the event loop.
+        if self.image_cache is None:
+            content, fresh = None, False
+        else:
+            content, fresh = await asyncio.to_thread(self.image_cache.lookup, key)
+        if fresh:
+            return await asyncio.to_thread(self._decode, content)
+
+        # With an image cache the PNG already lives on disk; keep only validators in SQLite.
+        # Decoding doubles as validation, so XML error documents are never stored.
+        return await cached_get(
+            client,
+            self.url,
+            params,
+            partial(self._decode_and_store, key, stale=content),
+            self.response_cache,
+            store_body=self.image_cache is None,
+            stale_body=content,
+        )
+
+    def _getmap_params(self, bbox: Dict[str, float], size: Tuple[int, int]) -> Dict[str, object]:
+        return {
             "service": "WMS",
             "request": "GetMap",
             "format": "image/png",
@@ -45,6 +105,44 @@ class WMSLayer:
             "width": size[0],
             "height": size[1],
         }
-        response = self.session.get(self.url, params=params, timeout=30)
-        response.raise_for_status()
-        return Image.open(BytesIO(response.content)).convert("RGBA")
+
+    def _cache_key(self, params: Dict[str, object]) -> str:
+        # GetMap responses are fully determined by the service URL and request parameters.
+        return extent_hash({"url": self.url, **params})
+
+    def _cached(self, key: str) -> Optional[bytes]:
+        return None if self.image_cache is None else self.image_cache.get(key)
+
+    def _decode_and_store(self, key: str, content: bytes, stale: Optional[bytes] = None) -> Image.Image:
+        # Decode first: WMS servers report errors as XML with a 200 status, which must not be cached.
+        image = self._decode(content)
+        if self.image_cache is not None:
+            # A revalidated (304) image only needs its age reset, not a rewrite.
+            if content != stale or not self.image_cache.touch(key):
+                self.image_cache.put(key, content)
+        return image
+
+    def _decode(self, content: bytes) -> Image.Image:
+        try:
+            if pyvips is not None:
+                return _decode_with_vips(content)
+            image = Image.open(BytesIO(content), formats=["PNG"])
+            image.load()
+        except _DECODE_ERRORS as exc:
+            # Typically a ServiceException XML document sent with a 200 status.
+            raise WMSLayerError(f"Layer '{self.config.name}' returned a payload that is not a PNG image.") from exc
+        # Transparent tiles are usually RGBA already; avoid a full-image copy.
+        return image if image.mode == "RGBA" else image.convert("RGBA")
+
+
+def _decode_with_vips(content: bytes) -> Image.Image:
+    """Decode a PNG to RGBA with libvips and wrap the pixel buffer as a PIL image."""
+
+    image = pyvips.Image.pngload_buffer(content, access="sequential")
+    if image.interpretation != "srgb":
+        image = image.colourspace("srgb")
+    if image.format != "uchar":
+        image = image.cast("uchar")
+    if not image.hasalpha():
+        image = image.addalpha()
+    return Image.frombuffer("RGBA", (image.width, image.height), image.write_to_memory(), "raw", "RGBA", 0, 1)
@@ -2,15 +2,32 @@
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import geopandas as gpd
-import matplotlib.pyplot as plt
-from matplotlib.axes import Axes
-from PIL import Image
-from shapely.geometry import base as shapely_base
+import matplotlib
+
+matplotlib.use("Agg")
+
+from matplotlib.axes import Axes  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+from PIL import Image, ImageDraw, ImageFont, features  # noqa: E402
+from shapely.geometry import base as shapely_base  # noqa: E402
+
+# One reusable Agg figure per thread; Figure objects must not be shared across threads.
+_FIGURE_POOL = threading.local()
+
+# Matplotlib's default title ("large") and the message size, in points.
+_TITLE_POINTS = 14.4
+_MESSAGE_POINTS = 12.0
+
+# DejaVu Sans ships with matplotlib; Pillow's bundled default font lacks glyphs such as "–".
+_PLACEHOLDER_FONT = Path(matplotlib.get_data_path()) / "fonts" / "ttf" / "DejaVuSans.ttf"
 
 
 @dataclass
@@ -26,14 +43,18 @@ class FigureSpec:
 def render_placeholder_png(path: Path, spec: FigureSpec, message: str) -> None:
     """Write a placeholder PNG while the real renderer is under construction."""
 
-    fig = plt.figure(figsize=(spec.width / spec.dpi, spec.height / spec.dpi), dpi=spec.dpi)
+    if features.check("freetype2"):
+        _render_placeholder_pillow(path, spec, message)
+        return
+
+    # Pillow's bitmap fallback font is Latin-1 only and fixed-size; let matplotlib lay out text.
+    fig = _pooled_figure(spec)
     ax = fig.add_subplot(111)
     ax.axis("off")
     if spec.title:
         ax.set_title(spec.title)
     ax.text(0.5, 0.5, message, ha="center", va="center", fontsize=12, wrap=True)
-    fig.savefig(path, dpi=spec.dpi, bbox_inches="tight")
-    plt.close(fig)
+    _finalize(fig, path)
 
 
 def render_vector_layer(
@@ -51,7 +72,7 @@ def render_vector_layer(
         plot_kwargs = _vector_style_kwargs(style)
         vector.plot(ax=ax, **plot_kwargs)
     _draw_parcel_outline(ax, parcel_geom, style)
-    _finalize(fig, output_path, spec)
+    _finalize(fig, output_path)
 
 
 def render_wms_layer(
@@ -72,11 +93,71 @@ def render_wms_layer(
         alpha=float(style.get("opacity", 1.0)),
     )
     _draw_parcel_outline(ax, parcel_geom, style)
-    _finalize(fig, output_path, spec)
+    _finalize(fig, output_path)
+
 
+def _render_placeholder_pillow(path: Path, spec: FigureSpec, message: str) -> None:
+    """Draw the placeholder directly with Pillow, sized like the matplotlib version."""
 
-def _prepare_axes(spec: FigureSpec, extent: Tuple[float, float, float, float]) -> Tuple[plt.Figure, Axes]:
-    fig = plt.figure(figsize=(spec.width / spec.dpi, spec.height / spec.dpi), dpi=spec.dpi)
+    image = Image.new("RGB", (spec.width, spec.height), "white")
+    draw = ImageDraw.Draw(image)
+    if spec.title:
+        title_font = _placeholder_font(round(_TITLE_POINTS * spec.dpi / 72))
+        draw.text((spec.width / 2, spec.height * 0.04), spec.title, fill="black", font=title_font, anchor="mt")
+
+    font = _placeholder_font(round(_MESSAGE_POINTS * spec.dpi / 72))
+    lines = _wrap_text(message, font, spec.width * 0.9)
+    draw.multiline_text(
+        (spec.width / 2, spec.height / 2), "\n".join(lines), fill="black", font=font, anchor="mm", align="center"
+    )
+    # Placeholders are throwaway; favour encode speed over file size.
+    image.save(path, format="PNG", optimize=False, compress_level=1)
+
+
+@lru_cache(maxsize=16)
+def _placeholder_font(size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(str(_PLACEHOLDER_FONT), size)
+
+
+def _wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: float) -> List[str]:
+    """Greedy word wrap to a pixel width, preserving explicit line breaks."""
+
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if line and font.getlength(candidate) > max_width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+def _pooled_figure(spec: FigureSpec) -> Figure:
+    """Return this thread's cached figure resized to the spec."""
+
+    size = (spec.width / spec.dpi, spec.height / spec.dpi)
+    fig = getattr(_FIGURE_POOL, "figure", None)
+    if fig is None:
+        fig = Figure(figsize=size, dpi=spec.dpi)
+        FigureCanvasAgg(fig)
+        _FIGURE_POOL.figure = fig
+    else:
+        # Clear leftovers from a render that failed before finalizing.
+        fig.clf()
+        if fig.dpi != spec.dpi:
+            fig.set_dpi(spec.dpi)
+        if tuple(fig.get_size_inches()) != size:
+            fig.set_size_inches(size)
+    fig.subplots_adjust(left=0.02, right=0.98, bottom=0.02, top=0.92 if spec.title else 0.98)
+    return fig
+
+
+def _prepare_axes(spec: FigureSpec, extent: Tuple[float, float, float, float]) -> Tuple[Figure, Axes]:
+    fig = _pooled_figure(spec)
     ax = fig.add_subplot(111)
     ax.set_xlim(extent[0], extent[2])
     ax.set_ylim(extent[1], extent[3])
@@ -107,6 +188,7 @@ def _draw_parcel_outline(ax: Axes, parcel_geom: shapely_base.BaseGeometry, style
     )
 
 
-def _finalize(fig: plt.Figure, output_path: Path, spec: FigureSpec) -> None:
-    fig.savefig(output_path, dpi=spec.dpi, bbox_inches="tight", pad_inches=0.05)
-    plt.close(fig)
+def _finalize(fig: Figure, output_path: Path) -> None:
+    # Written at the figure's own size; a tight bbox would cost an extra draw pass.
+    fig.canvas.print_png(output_path)
+    fig.clf()
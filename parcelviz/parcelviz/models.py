@@ -2,38 +2,43 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 GeometryLike = Dict[str, object]
 
+# Characters replaced when an APN is used as a directory name.
+_SAFE_APN_TABLE = str.maketrans({"/": "_", "\\": "_", " ": "_"})
+
 
 class RenderRequest(BaseModel):
     """Input payload for the render pipeline and API."""
 
+    model_config = ConfigDict(frozen=False, extra="ignore")
+
     address: Optional[str] = Field(None, description="Mailing or site address to resolve.")
     apn: Optional[str] = Field(None, description="Assessor parcel number.")
     layers: List[str] = Field(default_factory=list, description="Layer names requested for rendering.")
     buffer_feet: float = Field(250, ge=0, description="Buffer distance beyond parcel geometry.")
     output_dpi: int = Field(220, ge=96, le=600, description="Target DPI for exported images.")
 
-    @validator("layers")
+    @field_validator("layers")
+    @classmethod
     def _ensure_layers(cls, value: Iterable[str]) -> List[str]:
         items = [layer.strip() for layer in value if layer.strip()]
         if not items:
             raise ValueError("At least one layer must be specified.")
         return items
 
-    @validator("apn", always=True)
-    def _require_identifier(cls, v: Optional[str], values: Dict[str, object]) -> Optional[str]:
-        address = values.get("address")
-        if not v and not address:
+    @model_validator(mode="after")
+    def _require_identifier(self) -> "RenderRequest":
+        if not self.apn and not self.address:
             raise ValueError("Provide either an address or an APN.")
-        return v
+        return self
 
 
 @dataclass(slots=True)
@@ -45,6 +50,15 @@ class ParcelRecord:
     county: Optional[str]
     geometry: GeometryLike
     crs_epsg: int
+    sanitized_apn: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Slotted dataclasses cannot use cached_property; derive the path-safe APN once here.
+        sanitized = str(self.apn).translate(_SAFE_APN_TABLE)
+        # "", "." and ".." would resolve to the output root or its parent.
+        if not sanitized.strip("."):
+            sanitized = "_" * max(len(sanitized), 1)
+        self.sanitized_apn = sanitized
 
 
 @dataclass(slots=True)
@@ -3,14 +3,21 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, Optional
+import re
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
+import orjson
 import requests
 
+from .http import get_http_session
 from .models import ParcelRecord
 
 LOGGER = logging.getLogger(__name__)
 
+# Characters accepted in an APN; anything else could break out of the WHERE literal.
+_APN_PATTERN = re.compile(r"^[A-Za-z0-9 ._\-/]+$")
+
 
 class ParcelServiceError(RuntimeError):
     """Raised when parcel service operations fail."""
@@ -25,27 +32,31 @@ class ParcelService:
         id_field: str,
         address_field: Optional[str] = None,
         token: Optional[str] = None,
+        session: Optional[requests.Session] = None,
     ) -> None:
         self.url = url.rstrip("/")
         self.id_field = id_field
         self.address_field = address_field
         self.token = token
-        self.session = requests.Session()
+        self.session = session or get_http_session()
+        # Query constants shared by every lookup; only the WHERE clause and outSR vary.
+        self._base_params: Mapping[str, object] = MappingProxyType(
+            {"outFields": "*", "f": "geojson", "returnGeometry": "true"}
+        )
 
     def fetch_parcel_by_apn(self, apn: str, out_sr: int) -> ParcelRecord:
         """Query a parcel FeatureServer using an APN."""
 
-        params = {
-            "where": f"{self.id_field}='{apn}'",
-            "outFields": "*",
-            "f": "geojson",
+        params: Dict[str, object] = {
+            **self._base_params,
+            "where": f"{self.id_field}='{_escape_apn(apn)}'",
             "outSR": out_sr,
-            "returnGeometry": "true",
         }
         self._apply_token(params)
-        response = self.session.get(f"{self.url}/query", params=params, timeout=30)
+        # Stable parameter order gives identical URLs, and so identical cache keys, per APN.
+        response = self.session.get(f"{self.url}/query", params=sorted(params.items()), timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         features = data.get("features", [])
         if not features:
             raise ParcelServiceError(f"No parcel found for APN '{apn}'.")
@@ -63,3 +74,12 @@ class ParcelService:
     def _apply_token(self, params: Dict[str, object]) -> None:
         if self.token:
             params["token"] = self.token
+
+
+def _escape_apn(apn: str) -> str:
+    """Validate an APN for use inside a quoted ArcGIS WHERE literal."""
+
+    value = apn.strip()
+    if not _APN_PATTERN.match(value):
+        raise ParcelServiceError(f"Invalid APN '{apn}'.")
+    return value
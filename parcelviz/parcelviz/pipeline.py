@@ -2,21 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import shapely
 from shapely.geometry import shape
+from shapely.geometry.base import BaseGeometry
 
-from .cache import configure_requests_cache
+from .cache import ImageFileCache, ResponseCache, configure_requests_cache
 from .config_loader import ConfigError, SourceConfig, load_source_config
 from .crs import buffered_geometry_bounds
 from .geocode import GeocodeService, GeocodeError, LightBoxClient
+from .http import async_http_client, get_http_session
 from .layers import LayerRegistry as DEFAULT_LAYER_REGISTRY
 from .mapcompose import FigureSpec, render_placeholder_png, render_vector_layer, render_wms_layer
 from .models import LayerConfig, LayerResult, ParcelRecord, RenderRequest, RenderResponse
 from .settings import AppSettings, get_settings
-from .utils import ensure_directory
+from .utils import ensure_directory, retry_missing_directory
 
 LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +35,62 @@ class PipelineError(RuntimeError):
     """Raised when the pipeline cannot complete."""
 
 
+@lru_cache(maxsize=32)
+def _buffered_bounds(
+    parcel_wkb: bytes, src_epsg: int, dst_epsg: int, buffer_feet: float
+) -> Tuple[BaseGeometry, Tuple[float, float, float, float]]:
+    """Memoized `buffered_geometry_bounds`, keyed on WKB since geometries are unhashable."""
+
+    return buffered_geometry_bounds(shapely.from_wkb(parcel_wkb), src_epsg, dst_epsg, buffer_feet)
+
+
+def _warm_targets(layer_configs: Iterable[LayerConfig]) -> List[str]:
+    """Return one layer service URL per ``scheme://host`` origin.
+
+    Service endpoints are used rather than the host root, which many ArcGIS/WMS
+    servers answer slowly or reject.
+    """
+
+    targets: Dict[str, str] = {}
+    for layer_config in layer_configs:
+        url = layer_config.params.get("url")
+        if not url:
+            continue
+        parts = urlsplit(url)
+        if parts.scheme and parts.netloc:
+            targets.setdefault(f"{parts.scheme}://{parts.netloc}", url)
+    return list(targets.values())
+
+
+async def _warm_host(client: httpx.AsyncClient, url: str) -> None:
+    """Open a pooled connection (DNS, TCP, TLS) to a layer host with a cheap HEAD request."""
+
+    try:
+        await client.head(url, timeout=5)
+    except httpx.HTTPError as exc:
+        LOGGER.debug("Could not warm connection to %s: %s", url, exc)
+
+
+@dataclass
+class _FetchedLayer:
+    """Layer data fetched for a parcel, ready to be rendered."""
+
+    config: LayerConfig
+    spec: FigureSpec
+    bounds: Tuple[float, float, float, float]
+    projected_geom: BaseGeometry
+    data: Any
+
+    @property
+    def extent(self) -> Dict[str, float]:
+        return {
+            "xmin": self.bounds[0],
+            "ymin": self.bounds[1],
+            "xmax": self.bounds[2],
+            "ymax": self.bounds[3],
+        }
+
+
 class RenderPipeline:
     """High-level orchestrator translating requests into rendered outputs."""
 
@@ -40,32 +106,73 @@ class RenderPipeline:
         self.config = config or load_source_config(self.settings.config_path)
         self.geocode_service = geocode_service or self._build_geocode_service()
         self.layer_registry = layer_registry or dict(DEFAULT_LAYER_REGISTRY)
-        self._configure_cache()
+        self.cache_options = self._configure_cache()
+        self.wms_cache = self._build_wms_cache()
+        self.response_cache = self._build_response_cache()
+        self.http_session = get_http_session(self.cache_options)
+        self._adapter_factories = self._build_adapter_factories()
         self.figure_spec = self._figure_spec_from_config()
+        # Long-lived workers keep their thread-local matplotlib figures between runs; the same
+        # pool resolves parcels so a run never spins up extra threads.
+        self._render_executor = ThreadPoolExecutor(
+            max_workers=self.settings.render_workers or 8, thread_name_prefix="parcelviz-render"
+        )
+
+    def close(self) -> None:
+        """Release the render workers and the response cache connection."""
+
+        # Running renders finish on their own; don't block shutdown waiting for them.
+        self._render_executor.shutdown(wait=False)
+        if self.response_cache is not None:
+            self.response_cache.close()
 
     def run(self, request: RenderRequest) -> RenderResponse:
         """Execute the full render flow for a request."""
 
-        try:
-            parcel = self._resolve_parcel(request)
-        except GeocodeError as exc:
-            raise PipelineError(str(exc)) from exc
+        return asyncio.run(self.run_async(request))
 
-        output_dir = ensure_directory(self._output_dir(parcel))
-        layer_results: List[LayerResult] = []
+    async def run_async(
+        self, request: RenderRequest, client: Optional[httpx.AsyncClient] = None
+    ) -> RenderResponse:
+        """Execute the full render flow on the running event loop.
+
+        Network I/O stays on the loop; parcel resolution and matplotlib rendering run on
+        the render executor so the loop keeps issuing requests. Long-lived callers (the
+        API) pass their own ``client`` so keep-alive and HTTP/2 connections outlive a
+        single render; without one, a client is opened for this render's fetches.
+        """
+
+        loop = asyncio.get_running_loop()
+        # One timestamp for the response and every layer result in it.
+        now = datetime.now(timezone.utc)
+        # Resolve the parcel on a worker while layer configs are looked up and layer hosts warmed.
+        parcel_future = loop.run_in_executor(self._render_executor, self._resolve_parcel, request)
+        layer_configs: List[LayerConfig] = []
         for layer_name in request.layers:
             try:
-                layer_config = self.config.get_layer(layer_name)
+                layer_configs.append(self.config.get_layer(layer_name))
             except ConfigError as exc:
                 LOGGER.error("Layer '%s' not defined: %s", layer_name, exc)
-                continue
-            try:
-                result = self._render_layer(layer_config, parcel, request, output_dir)
-            except Exception as exc:  # pylint: disable=broad-except
-                LOGGER.exception("Layer '%s' failed: %s", layer_name, exc)
-                result = self._render_layer_failure(layer_config, parcel, request, output_dir, exc)
-            if result:
-                layer_results.append(result)
+
+        parcel, fetched = await self._fetch_layers(layer_configs, parcel_future, request, client)
+        output_dir = ensure_directory(self._output_dir(parcel))
+        # gather keeps results in submission order so response.images follows request.layers.
+        rendered = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._render_executor,
+                    self._render_layer_safe,
+                    layer_config,
+                    outcome,
+                    parcel,
+                    request,
+                    output_dir,
+                    now,
+                )
+                for layer_config, outcome in zip(layer_configs, fetched)
+            )
+        )
+        layer_results = [result for result in rendered if result]
 
         images = {result.name: self._to_public_url(result.path) for result in layer_results}
         warnings = [warn for result in layer_results for warn in result.warnings]
@@ -78,65 +185,142 @@ class RenderPipeline:
             },
             images=images,
             contact_sheet=None,
-            created_at=datetime.utcnow(),
+            created_at=now,
             warnings=warnings,
         )
 
     def _resolve_parcel(self, request: RenderRequest) -> ParcelRecord:
         return self.geocode_service.resolve(address=request.address, apn=request.apn)
 
-    def _render_layer(
+    async def _fetch_layers(
+        self,
+        layer_configs: Sequence[LayerConfig],
+        parcel_future: Awaitable[ParcelRecord],
+        request: RenderRequest,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> Tuple[ParcelRecord, List[Any]]:
+        """Await the parcel, then fetch data for all layers concurrently.
+
+        Connections to each layer host are opened while the parcel is still resolving;
+        the warm-ups never delay the fetches and are cancelled once those finish.
+        Layer results (or their exceptions) are returned in order.
+        """
+
+        if client is None:
+            async with async_http_client() as owned_client:
+                return await self._fetch_layers(layer_configs, parcel_future, request, owned_client)
+
+        warmers = [asyncio.create_task(_warm_host(client, url)) for url in _warm_targets(layer_configs)]
+        try:
+            try:
+                parcel = await parcel_future
+            except GeocodeError as exc:
+                raise PipelineError(str(exc)) from exc
+            try:
+                parcel_wkb = shape(parcel.geometry).wkb
+            except (KeyError, TypeError, ValueError) as exc:
+                raise PipelineError(f"Invalid parcel geometry: {exc}") from exc
+
+            fetched = await asyncio.gather(
+                *(
+                    self._fetch_layer(layer_config, parcel, parcel_wkb, request, client)
+                    for layer_config in layer_configs
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            for warmer in warmers:
+                warmer.cancel()
+            await asyncio.gather(*warmers, return_exceptions=True)
+        return parcel, fetched
+
+    async def _fetch_layer(
         self,
         layer_config: LayerConfig,
         parcel: ParcelRecord,
+        parcel_wkb: bytes,
         request: RenderRequest,
-        output_dir: Path,
-    ) -> LayerResult:
-        """Render a single layer output."""
+        client: httpx.AsyncClient,
+    ) -> _FetchedLayer:
+        """Resolve the layer extent and fetch its data."""
 
-        parcel_geom = shape(parcel.geometry)
-        projected_geom, bounds = buffered_geometry_bounds(
-            parcel_geom, parcel.crs_epsg, layer_config.target_epsg, request.buffer_feet
+        projected_geom, bounds = _buffered_bounds(
+            parcel_wkb, parcel.crs_epsg, layer_config.target_epsg, request.buffer_feet
         )
-        extent_dict = {
-            "xmin": bounds[0],
-            "ymin": bounds[1],
-            "xmax": bounds[2],
-            "ymax": bounds[3],
-        }
         spec = FigureSpec(
             width=self.figure_spec.width,
             height=self.figure_spec.height,
             dpi=request.output_dpi,
             title=f"{parcel.apn} – {layer_config.name.title()}",
         )
-        output_path = output_dir / f"{layer_config.name}.png"
+        layer = _FetchedLayer(config=layer_config, spec=spec, bounds=bounds, projected_geom=projected_geom, data=None)
         adapter = self._build_layer_adapter(layer_config)
 
+        if layer_config.type == "arcgis_feature":
+            kwargs: Dict[str, Any] = {}
+        elif layer_config.type == "wms":
+            kwargs = {"size": (spec.width, spec.height)}
+        else:
+            raise PipelineError(f"Unsupported layer type '{layer_config.type}'.")
+
+        # Adapters without an async path (e.g. custom registrations) run in a worker thread.
+        fetch_async = getattr(adapter, "fetch_async", None)
+        if fetch_async is not None:
+            layer.data = await fetch_async(client, layer.extent, **kwargs)
+        else:
+            layer.data = await asyncio.to_thread(adapter.fetch, layer.extent, **kwargs)
+        return layer
+
+    def _render_layer_safe(
+        self,
+        layer_config: LayerConfig,
+        outcome: Any,
+        parcel: ParcelRecord,
+        request: RenderRequest,
+        output_dir: Path,
+        now: datetime,
+    ) -> Optional[LayerResult]:
+        """Render a fetched layer, falling back to a placeholder if fetching or rendering failed."""
+
+        try:
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return retry_missing_directory(output_dir, partial(self._render_layer, outcome, output_dir, now=now))
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.exception("Layer '%s' failed: %s", layer_config.name, exc)
+            return retry_missing_directory(
+                output_dir,
+                partial(self._render_layer_failure, layer_config, parcel, request, output_dir, exc, now=now),
+            )
+
+    def _render_layer(self, layer: _FetchedLayer, output_dir: Path, *, now: datetime) -> LayerResult:
+        """Render a single layer output."""
+
+        layer_config = layer.config
+        output_path = output_dir / f"{layer_config.name}.png"
+        style = layer_config.params.get("style", {})
+
         warnings: List[str] = []
 
         if layer_config.type == "arcgis_feature":
-            data = adapter.fetch(extent_dict)
-            if data.empty:
+            if layer.data.empty:
                 warnings.append("No features returned for extent.")
             render_vector_layer(
                 output_path=output_path,
-                spec=spec,
-                extent=bounds,
-                parcel_geom=projected_geom,
-                vector=data,
-                style=layer_config.params.get("style", {}),
+                spec=layer.spec,
+                extent=layer.bounds,
+                parcel_geom=layer.projected_geom,
+                vector=layer.data,
+                style=style,
             )
         elif layer_config.type == "wms":
-            width_px, height_px = spec.width, spec.height
-            image = adapter.fetch(extent_dict, size=(width_px, height_px))
             render_wms_layer(
                 output_path=output_path,
-                spec=spec,
-                extent=bounds,
-                parcel_geom=projected_geom,
-                image=image,
-                style=layer_config.params.get("style", {}),
+                spec=layer.spec,
+                extent=layer.bounds,
+                parcel_geom=layer.projected_geom,
+                image=layer.data,
+                style=style,
             )
         else:
             raise PipelineError(f"Unsupported layer type '{layer_config.type}'.")
@@ -146,7 +330,7 @@ class RenderPipeline:
             path=output_path,
             warnings=warnings,
             crs_epsg=layer_config.target_epsg,
-            created_at=datetime.utcnow(),
+            created_at=now,
         )
 
     def _render_layer_failure(
@@ -156,6 +340,8 @@ class RenderPipeline:
         request: RenderRequest,
         output_dir: Path,
         exc: Exception,
+        *,
+        now: datetime,
     ) -> Optional[LayerResult]:
         output_path = output_dir / f"{layer_config.name}_error.png"
         render_placeholder_png(
@@ -173,12 +359,11 @@ class RenderPipeline:
             path=output_path,
             warnings=[f"Layer '{layer_config.name}' failed: {exc}"],
             crs_epsg=layer_config.target_epsg,
-            created_at=datetime.utcnow(),
+            created_at=now,
         )
 
     def _output_dir(self, parcel: ParcelRecord) -> Path:
-        root = self.settings.output_root
-        return root / parcel.apn.replace("/", "_")
+        return self.settings.output_root / parcel.sanitized_apn
 
     def _to_public_url(self, path: Path) -> str:
         try:
@@ -195,14 +380,39 @@ class RenderPipeline:
             client = None
         return GeocodeService(lightbox_client=client)
 
-    def _configure_cache(self) -> None:
+    def _configure_cache(self) -> Dict[str, Any]:
         cache_settings = self.config.cache
         backend = cache_settings.get("backend", "sqlite")
         expire_hours = cache_settings.get("expire_hours")
-        cache_path = Path(cache_settings.get("path", self.settings.cache_path))
+        return configure_requests_cache(self._cache_path(), expire_hours=expire_hours, backend=backend)
+
+    def _cache_path(self) -> Path:
+        cache_path = Path(self.config.cache.get("path", self.settings.cache_path))
         if not cache_path.is_absolute():
             cache_path = self.settings.config_path.parent / cache_path
-        configure_requests_cache(cache_path, expire_hours=expire_hours, backend=backend)
+        return cache_path
+
+    def _build_wms_cache(self) -> Optional[ImageFileCache]:
+        cache_settings = self.config.cache
+        wms_cache_mb = cache_settings.get("wms_cache_mb", 512)
+        if not wms_cache_mb:
+            return None
+        return ImageFileCache(
+            self._cache_path().parent / "wms",
+            max_bytes=int(wms_cache_mb) * 1024 * 1024,
+            expire_hours=cache_settings.get("expire_hours"),
+        )
+
+    def _build_response_cache(self) -> Optional[ResponseCache]:
+        cache_settings = self.config.cache
+        layer_cache_mb = cache_settings.get("layer_cache_mb", 256)
+        if not layer_cache_mb:
+            return None
+        return ResponseCache(
+            self._cache_path(),
+            max_bytes=int(layer_cache_mb) * 1024 * 1024,
+            expire_hours=cache_settings.get("expire_hours"),
+        )
 
     def _figure_spec_from_config(self) -> FigureSpec:
         map_spec = self.config.map_spec
@@ -213,12 +423,23 @@ class RenderPipeline:
             title=None,
         )
 
-    def _build_layer_adapter(self, layer_config):
-        try:
-            layer_cls = self.layer_registry[layer_config.type]
-        except KeyError as exc:
-            raise PipelineError(f"Layer type '{layer_config.type}' is not registered.") from exc
-        kwargs = {}
-        if layer_config.type.startswith("arcgis") and self.settings.arcgis_token:
-            kwargs["token"] = self.settings.arcgis_token
-        return layer_cls(layer_config, **kwargs)
+    def _build_adapter_factories(self) -> Dict[str, Callable[[LayerConfig], Any]]:
+        """Bind each registered layer type to its adapter class and shared dependencies."""
+
+        factories: Dict[str, Callable[[LayerConfig], Any]] = {}
+        for layer_type, layer_cls in self.layer_registry.items():
+            kwargs: Dict[str, Any] = {"session": self.http_session}
+            if layer_type.startswith("arcgis") and self.settings.arcgis_token:
+                kwargs["token"] = self.settings.arcgis_token
+            if layer_type == "wms":
+                kwargs["image_cache"] = self.wms_cache
+            if layer_type in ("arcgis_feature", "wms"):
+                kwargs["response_cache"] = self.response_cache
+            factories[layer_type] = partial(layer_cls, **kwargs)
+        return factories
+
+    def _build_layer_adapter(self, layer_config: LayerConfig) -> Any:
+        factory = self._adapter_factories.get(layer_config.type)
+        if factory is None:
+            raise PipelineError(f"Layer type '{layer_config.type}' is not registered.")
+        return factory(layer_config)
@@ -1,16 +1,37 @@
 """Application settings loaded from environment variables."""
 
+from __future__ import annotations
+
+import dataclasses
+import os
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Mapping, Optional
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+try:  # Optional .env support.
+    from dotenv import dotenv_values
+except ImportError:
+    dotenv_values = None
 
+ENV_FILE = Path(".env")
 
-class AppSettings(BaseSettings):
-    """Runtime configuration for the ParcelViz service."""
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "f", "no", "n", "off"})
+
+
+def _to_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    raise ValueError(f"invalid boolean '{value}'")
 
-    model_config = SettingsConfigDict(env_file=(".env",), env_file_encoding="utf-8", case_sensitive=False)
+
+@dataclass(frozen=True, slots=True)
+class AppSettings:
+    """Runtime configuration for the ParcelViz service."""
 
     config_path: Path = Path("config/sources.yaml")
     output_root: Path = Path("outputs")
@@ -21,15 +42,52 @@ class AppSettings(BaseSettings):
 
     arcgis_token: Optional[str] = None
 
+    render_workers: int = 8
+
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     api_reload: bool = False
+    api_workers: int = 1
 
     log_level: str = "INFO"
 
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None, env_file: Path = ENV_FILE) -> "AppSettings":
+        """Build settings from environment variables, falling back to `.env` values.
+
+        Variable names are matched case-insensitively against field names, and real
+        environment variables take precedence over the env file.
+        """
+
+        values: Dict[str, str] = {}
+        if dotenv_values is not None and env_file.is_file():
+            values.update({key.lower(): value for key, value in dotenv_values(env_file).items() if value is not None})
+        values.update({key.lower(): value for key, value in (os.environ if environ is None else environ).items()})
+
+        kwargs: Dict[str, Any] = {}
+        for field in dataclasses.fields(cls):
+            if field.name not in values:
+                continue
+            try:
+                kwargs[field.name] = _COERCERS.get(field.name, str)(values[field.name])
+            except ValueError as exc:
+                raise ValueError(f"Invalid value for setting '{field.name}': {exc}") from exc
+        return cls(**kwargs)
+
+
+_COERCERS: Dict[str, Callable[[str], Any]] = {
+    "config_path": Path,
+    "output_root": Path,
+    "cache_path": Path,
+    "render_workers": int,
+    "api_port": int,
+    "api_reload": _to_bool,
+    "api_workers": int,
+}
+
 
 @lru_cache
 def get_settings() -> "AppSettings":
     """Return cached settings instance."""
 
-    return AppSettings()
+    return AppSettings.from_env()
@@ -4,19 +4,54 @@ from __future__ import annotations
 
 import hashlib
 import json
+import struct
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Set, TypeVar
+
+_BBOX_KEYS = ("xmin", "ymin", "xmax", "ymax")
+_BBOX_KEY_SET = frozenset(_BBOX_KEYS)
 
 
 def extent_hash(extent: Dict[str, Any]) -> str:
     """Return a deterministic hash for an extent dictionary."""
 
+    # Plain bounding boxes hash their packed coordinates, skipping JSON serialization.
+    if extent.keys() == _BBOX_KEY_SET:
+        try:
+            packed = struct.pack("<4d", *(extent[key] for key in _BBOX_KEYS))
+        except struct.error:
+            pass
+        else:
+            return hashlib.blake2b(packed, digest_size=16, person=b"bbox").hexdigest()
     normalized = json.dumps(extent, sort_keys=True, separators=(",", ":"))
-    return hashlib.md5(normalized.encode("utf-8")).hexdigest()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Directories created by this process. If one is removed while it runs,
+# `retry_missing_directory` recreates it on the next failed write.
+_KNOWN_DIRS: Set[Path] = set()
+
+T = TypeVar("T")
 
 
 def ensure_directory(path: Path) -> Path:
     """Ensure that a directory exists."""
 
+    if path in _KNOWN_DIRS:
+        return path
     path.mkdir(parents=True, exist_ok=True)
+    _KNOWN_DIRS.add(path)
     return path
+
+
+def retry_missing_directory(path: Path, write: Callable[[], T]) -> T:
+    """Run ``write``; if ``path`` was deleted underneath it, recreate the directory and retry once."""
+
+    try:
+        return write()
+    except FileNotFoundError:
+        if path.is_dir():
+            raise
+        _KNOWN_DIRS.discard(path)
+        ensure_directory(path)
+        return write()
@@ -0,0 +1,87 @@
+"""Tests for cache helpers."""
+
+import os
+import time
+
+import pytest
+
+from parcelviz.cache import ImageFileCache, ResponseCache, response_freshness
+
+
+def test_image_cache_round_trip_and_missing_key(tmp_path):
+    cache = ImageFileCache(tmp_path / "wms")
+
+    assert cache.get("missing") is None
+    cache.put("tile", b"png-bytes")
+
+    assert cache.get("tile") == b"png-bytes"
+    assert [path.name for path in (tmp_path / "wms").iterdir()] == ["tile.png"]
+
+
+def test_image_cache_evicts_least_recently_used(tmp_path):
+    cache = ImageFileCache(tmp_path, max_bytes=25)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"x" * 10)
+    os.utime(tmp_path / "a.png", (1_000, 1_000))
+    os.utime(tmp_path / "b.png", (2_000, 2_000))
+    assert cache.get("a") is not None  # Reading refreshes the access time.
+
+    cache.put("c", b"x" * 10)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.png", "c.png"]
+
+
+def test_image_cache_ignores_expired_entries(tmp_path):
+    cache = ImageFileCache(tmp_path, expire_hours=1)
+    cache.put("tile", b"png-bytes")
+    os.utime(tmp_path / "tile.png", (0, 0))
+
+    assert cache.get("tile") is None
+
+
+def test_response_cache_keeps_stale_entries_only_when_they_can_be_revalidated(tmp_path):
+    cache = ResponseCache(tmp_path / "http_cache.sqlite", expire_hours=1)
+    cache.put("query", '"v1"', None, b"{}")
+    cache.put("plain", None, None, b"{}")
+
+    assert cache.get("query")["fresh"] is True
+    cache.expire_seconds = -1
+    assert cache.get("query")["fresh"] is False
+    assert cache.get("plain") is None
+
+
+def test_response_cache_evicts_least_recently_used_bodies(tmp_path):
+    cache = ResponseCache(tmp_path / "http_cache.sqlite", max_bytes=25)
+    cache.put("a", '"a"', None, b"x" * 10)
+    time.sleep(0.01)
+    cache.put("b", '"b"', None, b"x" * 10)
+    time.sleep(0.01)
+    assert cache.get("a") is not None
+
+    cache.put("c", '"c"', None, b"x" * 10)
+    cache.put("wms", '"w"', None, None)  # Validators only; costs nothing against the cap.
+
+    assert cache.get("b") is None
+    assert [cache.get(key)["etag"] for key in ("a", "c", "wms")] == ['"a"', '"c"', '"w"']
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"Cache-Control": "no-store"}, (False, None)),
+        ({"Cache-Control": "no-cache", "Expires": "Thu, 01 Jan 2099 00:00:00 GMT"}, (True, 1000.0)),
+        ({"Cache-Control": "public, max-age=60", "Expires": "Thu, 01 Jan 2099 00:00:00 GMT"}, (True, 1060.0)),
+        ({"Expires": "Thu, 01 Jan 1970 00:20:00 GMT"}, (True, 1200.0)),
+        ({"Expires": "0"}, (True, 1000.0)),
+        ({}, (True, None)),
+    ],
+)
+def test_response_freshness_follows_cache_control_then_expires(headers, expected):
+    assert response_freshness(headers, now=1000.0) == expected
+
+
+def test_response_cache_honours_server_expiry_over_expire_hours(tmp_path):
+    cache = ResponseCache(tmp_path / "http_cache.sqlite", expire_hours=12)
+    cache.put("query", '"v1"', None, b"{}", expires_at=time.time() - 1)
+
+    assert cache.get("query")["fresh"] is False
@@ -0,0 +1,48 @@
+"""Tests for configuration loading."""
+
+import pytest
+
+from parcelviz.config_loader import ConfigError, SourceConfig
+
+
+def _config() -> SourceConfig:
+    return SourceConfig(
+        {
+            "default_crs": 4326,
+            "layers": {
+                "zoning": {"type": "arcgis_feature", "target_epsg": 2264, "style": {"color": "#004b8d"}},
+                "flood": {"type": "wms"},
+            },
+        }
+    )
+
+
+def test_get_layer_resolves_defaults():
+    config = _config()
+
+    zoning = config.get_layer("zoning")
+    flood = config.get_layer("flood")
+
+    assert zoning.target_epsg == 2264
+    assert zoning.params == {"style": {"color": "#004b8d"}}
+    assert flood.target_epsg == 4326
+    assert [layer.name for layer in config.layers] == ["zoning", "flood"]
+
+
+def test_get_layer_unknown_raises_config_error():
+    with pytest.raises(ConfigError):
+        _config().get_layer("missing")
+
+
+def test_layer_without_type_is_rejected():
+    with pytest.raises(ConfigError):
+        SourceConfig({"layers": {"broken": {"url": "https://example.com"}}})
+
+
+def test_to_dict_returns_independent_copy():
+    config = _config()
+
+    snapshot = config.to_dict()
+    snapshot["layers"]["zoning"]["style"]["color"] = "#000000"
+
+    assert config.to_dict()["layers"]["zoning"]["style"]["color"] == "#004b8d"
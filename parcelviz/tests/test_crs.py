@@ -0,0 +1,78 @@
+"""Tests for CRS helpers."""
+
+import geopandas as gpd
+from shapely.geometry import MultiPolygon, Point, Polygon
+
+from parcelviz.crs import (
+    _EPSG_UNITS,
+    _cached_crs,
+    _cached_transformer,
+    buffered_geometry_bounds,
+    buffered_geometry_bounds_batch,
+    feet_to_crs_units,
+    reproject_gdf,
+    reproject_geometry,
+    shapely_transform,
+)
+
+
+def test_reproject_geometry_matches_per_point_transform():
+    polygon = Polygon(
+        [(-80.0, 35.0), (-80.0, 35.001), (-79.999, 35.001), (-79.999, 35.0), (-80.0, 35.0)],
+        holes=[[(-79.9995, 35.0002), (-79.9995, 35.0004), (-79.9993, 35.0004), (-79.9995, 35.0002)]],
+    )
+
+    projected = reproject_geometry(polygon, 4326, 3857)
+    expected = shapely_transform(_cached_transformer(4326, 3857).transform, polygon)
+
+    assert projected.equals_exact(expected, 1e-6)
+    assert len(projected.interiors) == 1
+
+
+def test_reproject_gdf_returns_same_frame_when_already_in_target_crs():
+    gdf = gpd.GeoDataFrame(geometry=[Point(-80.0, 35.0)], crs="EPSG:4326")
+
+    assert reproject_gdf(gdf, 4326) is gdf
+    assert reproject_gdf(gdf, 3857).crs.to_epsg() == 3857
+
+
+def test_buffered_geometry_bounds_expands_bounds_by_buffer():
+    polygon = Polygon([(0.0, 0.0), (0.0, 100.0), (80.0, 140.0), (120.0, 20.0), (0.0, 0.0)])
+
+    projected, bounds = buffered_geometry_bounds(polygon, 2264, 2264, 50.0)
+
+    assert projected is polygon
+    assert bounds == (-50.0, -50.0, 170.0, 190.0)
+    approximate = polygon.buffer(50.0, quad_segs=64).bounds
+    assert all(abs(a - b) < 1e-2 for a, b in zip(bounds, approximate))
+
+
+def test_epsg_unit_table_matches_pyproj():
+    for epsg, unit_name in _EPSG_UNITS.items():
+        assert _cached_crs(epsg).axis_info[0].unit_name.lower() == unit_name, epsg
+
+
+def test_feet_to_crs_units():
+    assert feet_to_crs_units(100, 2264) == 100
+    assert feet_to_crs_units(100, 3857) == 100 * 0.3048
+    assert feet_to_crs_units(100, 32145) == 100 * 0.3048  # Not in the table; resolved via pyproj.
+
+
+def test_buffered_geometry_bounds_batch_matches_single_parcel_path():
+    parcels = [
+        Polygon(
+            [(-80.0, 35.0), (-80.0, 35.001), (-79.999, 35.001), (-80.0, 35.0)],
+            holes=[[(-79.9998, 35.0006), (-79.9998, 35.0008), (-79.9996, 35.0008), (-79.9998, 35.0006)]],
+        ),
+        MultiPolygon([Polygon([(-78.0, 36.0), (-78.0, 36.001), (-77.999, 36.0)]), Point(-77.99, 36.0).buffer(0.001)]),
+        Point(-79.0, 35.5, 10.0),
+    ]
+
+    projected, bounds = buffered_geometry_bounds_batch(parcels, 4326, 2264, 100.0)
+
+    assert bounds.shape == (3, 4)
+    for parcel, geom, row in zip(parcels, projected, bounds):
+        expected_geom, expected_bounds = buffered_geometry_bounds(parcel, 4326, 2264, 100.0)
+        assert geom.equals_exact(expected_geom, 1e-6)
+        assert all(abs(a - b) < 1e-6 for a, b in zip(row, expected_bounds))
+    assert parcels[0].bounds[0] == -80.0
@@ -0,0 +1,347 @@
+"""Tests for layer adapters."""
+
+import asyncio
+import os
+from io import BytesIO
+
+import httpx
+import pytest
+import requests_cache
+import responses
+import respx
+from PIL import Image
+
+from parcelviz.cache import ImageFileCache, ResponseCache
+from parcelviz.layers.arcgis import ArcGISFeatureLayer, ArcGISLayerError
+from parcelviz.layers.wms import WMSLayer, WMSLayerError
+from parcelviz.models import LayerConfig
+from parcelviz.utils import extent_hash
+
+EXTENT = {"xmin": 0.0, "ymin": 0.0, "xmax": 10.0, "ymax": 10.0}
+
+
+@pytest.fixture
+def session():
+    """Isolated in-memory cached session so responses never leak between tests."""
+
+    return requests_cache.CachedSession(backend="memory")
+
+
+def _arcgis_layer(session=None, object_id_field="OBJECTID") -> ArcGISFeatureLayer:
+    params = {"url": "https://gis.example.com/FeatureServer/0"}
+    if object_id_field:
+        params["object_id_field"] = object_id_field
+    config = LayerConfig(name="zoning", type="arcgis_feature", target_epsg=3857, params=params)
+    return ArcGISFeatureLayer(config, session=session or requests_cache.CachedSession(backend="memory"))
+
+
+@responses.activate
+def test_arcgis_fetch_builds_geodataframe(session):
+    responses.get(
+        "https://gis.example.com/FeatureServer/0/query",
+        json={
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"ZONING": "R-1"},
+                    "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [0, 5], [5, 5], [0, 0]]]},
+                },
+                {"type": "Feature", "properties": {"ZONING": "C-2"}, "geometry": None},
+            ],
+        },
+    )
+
+    frame = _arcgis_layer(session).fetch(EXTENT)
+
+    assert list(frame["ZONING"]) == ["R-1", "C-2"]
+    assert frame.geometry.iloc[0].geom_type == "Polygon"
+    assert frame.geometry.iloc[1] is None
+    assert frame.crs.to_epsg() == 3857
+
+
+@responses.activate
+def test_arcgis_fetch_handles_empty_result(session):
+    responses.get("https://gis.example.com/FeatureServer/0/query", json={"features": []})
+
+    frame = _arcgis_layer(session).fetch(EXTENT)
+
+    assert frame.empty
+
+
+def test_arcgis_fetch_async_pages_ordered_results_when_transfer_limit_is_exceeded():
+    def feature(i):
+        return {"type": "Feature", "properties": {"OBJECTID": i}, "geometry": {"type": "Point", "coordinates": [i, i]}}
+
+    def query(request):
+        params = request.url.params
+        if params.get("returnCountOnly") == "true":
+            return httpx.Response(200, json={"count": 5})
+        assert params["orderByFields"] == "OBJECTID"
+        if "resultOffset" not in params:
+            # Server-capped first answer, already in object-id order.
+            return httpx.Response(200, json={"features": [feature(0), feature(1)], "exceededTransferLimit": True})
+        offset = int(params["resultOffset"])
+        count = int(params["resultRecordCount"])
+        return httpx.Response(200, json={"features": [feature(i) for i in range(offset, min(offset + count, 5))]})
+
+    layer = _arcgis_layer(object_id_field=None)
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await layer.fetch_async(client, EXTENT)
+
+    with respx.mock:
+        route = respx.get("https://gis.example.com/FeatureServer/0/query").mock(side_effect=query)
+        metadata = respx.get("https://gis.example.com/FeatureServer/0").mock(
+            return_value=httpx.Response(200, json={"objectIdField": "OBJECTID"})
+        )
+        frame = asyncio.run(fetch())
+
+    # First query, count, then the two remaining pages of two (the size the server capped us at).
+    assert route.call_count == 4
+    assert [call.request.url.params.get("resultOffset") for call in route.calls[2:]] == ["2", "4"]
+    assert metadata.call_count == 1
+    assert list(frame["OBJECTID"]) == [0, 1, 2, 3, 4]
+
+
+def test_arcgis_fetch_async_sends_a_single_query_when_results_fit():
+    with respx.mock:
+        route = respx.get("https://gis.example.com/FeatureServer/0/query").mock(
+            return_value=httpx.Response(200, json={"features": []})
+        )
+
+        async def fetch():
+            async with httpx.AsyncClient() as client:
+                return await _arcgis_layer().fetch_async(client, EXTENT)
+
+        frame = asyncio.run(fetch())
+
+    assert route.call_count == 1
+    assert frame.empty
+
+
+@responses.activate
+def test_wms_fetch_returns_rgba_image(session):
+    png = BytesIO()
+    Image.new("RGB", (8, 6), "red").save(png, format="PNG")
+    responses.get("https://wms.example.com/wms", body=png.getvalue(), content_type="image/png")
+    config = LayerConfig(
+        name="flood",
+        type="wms",
+        target_epsg=3857,
+        params={"url": "https://wms.example.com/wms", "layers": "Flood_Hazard_Zones"},
+    )
+
+    image = WMSLayer(config, session=session).fetch(EXTENT, size=(8, 6))
+
+    assert image.mode == "RGBA"
+    assert image.size == (8, 6)
+    assert image.getpixel((0, 0)) == (255, 0, 0, 255)
+
+
+def test_wms_fetch_async_serves_repeat_extents_from_image_cache(tmp_path):
+    png = BytesIO()
+    Image.new("RGBA", (8, 6), (0, 0, 255, 128)).save(png, format="PNG")
+    config = LayerConfig(
+        name="flood",
+        type="wms",
+        target_epsg=3857,
+        params={"url": "https://wms.example.com/wms", "layers": "Flood_Hazard_Zones"},
+    )
+    layer = WMSLayer(
+        config, session=requests_cache.CachedSession(backend="memory"), image_cache=ImageFileCache(tmp_path)
+    )
+
+    async def fetch_twice():
+        async with httpx.AsyncClient() as client:
+            return [await layer.fetch_async(client, EXTENT, size=(8, 6)) for _ in range(2)]
+
+    with respx.mock:
+        route = respx.get("https://wms.example.com/wms").mock(
+            return_value=httpx.Response(200, content=png.getvalue(), headers={"Content-Type": "image/png"})
+        )
+        first, second = asyncio.run(fetch_twice())
+
+    assert route.call_count == 1
+    assert first.tobytes() == second.tobytes()
+    assert len(list(tmp_path.glob("*.png"))) == 1
+
+
+def test_arcgis_fetch_async_serves_fresh_responses_and_revalidates_stale_ones(tmp_path):
+    body = {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "properties": {"ZONING": "R-1"}, "geometry": {"type": "Point", "coordinates": [1, 1]}}
+        ],
+    }
+
+    def query(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=body, headers={"ETag": '"v1"'})
+
+    layer = _arcgis_layer()
+    layer.response_cache = ResponseCache(tmp_path / "http_cache.sqlite", expire_hours=1)
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await layer.fetch_async(client, EXTENT)
+
+    with respx.mock:
+        route = respx.get("https://gis.example.com/FeatureServer/0/query").mock(side_effect=query)
+        first = asyncio.run(fetch())
+        cached = asyncio.run(fetch())  # Within expire_hours: served without a request.
+        assert route.call_count == 1
+        layer.response_cache.expire_seconds = -1
+        second = asyncio.run(fetch())
+
+    assert [call.response.status_code for call in route.calls] == [200, 304]
+    assert list(first["ZONING"]) == list(cached["ZONING"]) == list(second["ZONING"]) == ["R-1"]
+
+
+def test_arcgis_fetch_async_does_not_cache_error_payloads(tmp_path):
+    replies = iter(
+        [
+            httpx.Response(200, json={"error": {"code": 500, "message": "Database busy"}}),
+            httpx.Response(200, json={"features": []}),
+        ]
+    )
+    layer = _arcgis_layer()
+    layer.response_cache = ResponseCache(tmp_path / "http_cache.sqlite", expire_hours=12)
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await layer.fetch_async(client, EXTENT)
+
+    with respx.mock:
+        route = respx.get("https://gis.example.com/FeatureServer/0/query").mock(side_effect=lambda _: next(replies))
+        with pytest.raises(ArcGISLayerError, match="Database busy"):
+            asyncio.run(fetch())
+        frame = asyncio.run(fetch())
+
+    assert route.call_count == 2
+    assert frame.empty
+
+
+def test_wms_fetch_async_does_not_cache_service_exceptions_without_image_cache(tmp_path):
+    png = BytesIO()
+    Image.new("RGBA", (8, 6), (0, 255, 0, 255)).save(png, format="PNG")
+    replies = iter(
+        [
+            httpx.Response(200, content=b"<ServiceExceptionReport/>", headers={"Content-Type": "text/xml"}),
+            httpx.Response(200, content=png.getvalue(), headers={"Content-Type": "image/png"}),
+        ]
+    )
+    config = LayerConfig(
+        name="flood",
+        type="wms",
+        target_epsg=3857,
+        params={"url": "https://wms.example.com/wms", "layers": "Flood_Hazard_Zones"},
+    )
+    layer = WMSLayer(
+        config,
+        session=requests_cache.CachedSession(backend="memory"),
+        response_cache=ResponseCache(tmp_path / "http_cache.sqlite", expire_hours=12),
+    )
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await layer.fetch_async(client, EXTENT, size=(8, 6))
+
+    with respx.mock:
+        route = respx.get("https://wms.example.com/wms").mock(side_effect=lambda _: next(replies))
+        with pytest.raises(WMSLayerError, match="not a PNG"):
+            asyncio.run(fetch())
+        image = asyncio.run(fetch())
+
+    assert route.call_count == 2
+    assert image.size == (8, 6)
+
+
+def test_arcgis_fetch_async_drops_stored_error_instead_of_replaying_it_on_304(tmp_path):
+    layer = _arcgis_layer()
+    layer.response_cache = ResponseCache(tmp_path / "http_cache.sqlite", expire_hours=12)
+    key = extent_hash({"url": f"{layer.url}/query", **layer._query_params(EXTENT), "orderByFields": "OBJECTID"})
+    layer.response_cache.put(key, '"bad"', None, b'{"error": {"message": "Token expired"}}', expires_at=0)
+
+    def query(request):
+        if request.headers.get("If-None-Match") == '"bad"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"features": []})
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await layer.fetch_async(client, EXTENT)
+
+    with respx.mock:
+        route = respx.get("https://gis.example.com/FeatureServer/0/query").mock(side_effect=query)
+        with pytest.raises(ArcGISLayerError, match="Token expired"):
+            asyncio.run(fetch())
+        frame = asyncio.run(fetch())
+
+    assert [call.response.status_code for call in route.calls] == [304, 200]
+    assert frame.empty
+
+
+def test_arcgis_fetch_async_revalidates_no_cache_responses_within_expire_hours(tmp_path):
+    def query(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"features": []}, headers={"ETag": '"v1"', "Cache-Control": "no-cache"})
+
+    layer = _arcgis_layer()
+    layer.response_cache = ResponseCache(tmp_path / "http_cache.sqlite", expire_hours=12)
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await layer.fetch_async(client, EXTENT)
+
+    with respx.mock:
+        route = respx.get("https://gis.example.com/FeatureServer/0/query").mock(side_effect=query)
+        asyncio.run(fetch())
+        asyncio.run(fetch())
+
+    assert [call.response.status_code for call in route.calls] == [200, 304]
+
+
+def test_wms_revalidates_expired_image_without_storing_body_in_sqlite(tmp_path):
+    png = BytesIO()
+    Image.new("RGBA", (8, 6), (0, 255, 0, 255)).save(png, format="PNG")
+    config = LayerConfig(
+        name="flood",
+        type="wms",
+        target_epsg=3857,
+        params={"url": "https://wms.example.com/wms", "layers": "Flood_Hazard_Zones"},
+    )
+    image_cache = ImageFileCache(tmp_path / "wms", expire_hours=1)
+    response_cache = ResponseCache(tmp_path / "http_cache.sqlite")
+    layer = WMSLayer(
+        config,
+        session=requests_cache.CachedSession(backend="memory"),
+        image_cache=image_cache,
+        response_cache=response_cache,
+    )
+
+    def getmap(request):
+        if request.headers.get("If-None-Match") == '"tile-1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=png.getvalue(), headers={"ETag": '"tile-1"'})
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            return await layer.fetch_async(client, EXTENT, size=(8, 6))
+
+    with respx.mock:
+        route = respx.get("https://wms.example.com/wms").mock(side_effect=getmap)
+        first = asyncio.run(fetch())
+        (path,) = (tmp_path / "wms").glob("*.png")
+        os.utime(path, (0, 0))  # Make the on-disk image stale.
+        inode = path.stat().st_ino
+        second = asyncio.run(fetch())
+        third = asyncio.run(fetch())  # The 304 reset the image's age, so no request.
+
+    assert [call.response.status_code for call in route.calls] == [200, 304]
+    assert first.tobytes() == second.tobytes() == third.tobytes()
+    assert path.stat().st_ino == inode  # Touched in place, not rewritten.
+    assert response_cache._db.execute("SELECT content FROM layer_responses").fetchall() == [(None,)]
@@ -0,0 +1,36 @@
+"""Tests for request and domain models."""
+
+import pytest
+from pydantic import ValidationError
+
+from parcelviz.models import ParcelRecord, RenderRequest
+
+
+def test_render_request_strips_blank_layers():
+    request = RenderRequest(apn="123-456", layers=[" zoning ", "", "flood"])
+
+    assert request.layers == ["zoning", "flood"]
+
+
+def test_render_request_requires_layers():
+    with pytest.raises(ValidationError):
+        RenderRequest(address="123 Main St", layers=["  "])
+
+
+def test_render_request_requires_address_or_apn():
+    with pytest.raises(ValidationError):
+        RenderRequest(layers=["zoning"])
+
+
+def test_parcel_record_sanitized_apn_is_path_safe():
+    record = ParcelRecord(apn="12/34\\56 7", address=None, county=None, geometry={}, crs_epsg=4326)
+
+    assert record.sanitized_apn == "12_34_56_7"
+    assert record == ParcelRecord(apn="12/34\\56 7", address=None, county=None, geometry={}, crs_epsg=4326)
+
+
+@pytest.mark.parametrize(("apn", "expected"), [("", "_"), (".", "_"), ("..", "__"), ("1.2", "1.2")])
+def test_parcel_record_sanitized_apn_never_names_a_parent_directory(apn, expected):
+    record = ParcelRecord(apn=apn, address=None, county=None, geometry={}, crs_epsg=4326)
+
+    assert record.sanitized_apn == expected
@@ -0,0 +1,42 @@
+"""Tests for parcel service lookups."""
+
+import pytest
+import requests_cache
+import responses
+
+from parcelviz.parcels import ParcelService, ParcelServiceError
+
+URL = "https://gis.example.com/Parcels/FeatureServer/0"
+
+
+def _service() -> ParcelService:
+    return ParcelService(URL, id_field="PARCEL_ID", session=requests_cache.CachedSession(backend="memory"))
+
+
+@responses.activate
+def test_fetch_parcel_by_apn_builds_stable_query():
+    responses.get(
+        f"{URL}/query",
+        json={
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"PARCEL_ID": "123-456", "COUNTY": "Wake"},
+                    "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [0, 1], [1, 1], [0, 0]]]},
+                }
+            ]
+        },
+    )
+
+    parcel = _service().fetch_parcel_by_apn(" 123-456 ", out_sr=2264)
+
+    assert parcel.apn == "123-456"
+    assert parcel.county == "Wake"
+    query = responses.calls[0].request.url.split("?", 1)[1]
+    assert [pair.split("=")[0] for pair in query.split("&")] == ["f", "outFields", "outSR", "returnGeometry", "where"]
+    assert "where=PARCEL_ID%3D%27123-456%27" in query
+
+
+def test_fetch_parcel_by_apn_rejects_unsafe_apn():
+    with pytest.raises(ParcelServiceError):
+        _service().fetch_parcel_by_apn("1' OR '1'='1", out_sr=2264)
@@ -1,15 +1,22 @@
 """Tests for the render pipeline."""
 
+import asyncio
+import shutil
+import sqlite3
+import time
 from datetime import datetime
 from pathlib import Path
 
 import geopandas as gpd
+import httpx
 import pytest
+import respx
 from shapely.geometry import box
 
 from parcelviz.config_loader import SourceConfig
-from parcelviz.models import ParcelRecord, RenderRequest
-from parcelviz.pipeline import RenderPipeline
+from parcelviz.layers.arcgis import ArcGISFeatureLayer
+from parcelviz.models import LayerConfig, ParcelRecord, RenderRequest
+from parcelviz.pipeline import RenderPipeline, _warm_targets
 from parcelviz.settings import get_settings
 
 
@@ -41,8 +48,13 @@ class DummyGeocodeService:
 class DummyLayer:
     """Layer adapter that returns a simple square GeoDataFrame."""
 
-    def __init__(self, config, **_):
+    instances = []
+
+    def __init__(self, config, session=None, **kwargs):
         self.config = config
+        self.session = session
+        self.kwargs = kwargs
+        DummyLayer.instances.append(self)
 
     def fetch(self, extent):
         geom = box(extent["xmin"], extent["ymin"], extent["xmax"], extent["ymax"])
@@ -95,3 +107,280 @@ def test_pipeline_renders_vector_layer(tmp_path, monkeypatch):
     assert path.stat().st_size > 0
     assert response.warnings == []
     assert isinstance(response.created_at, datetime)
+    assert response.created_at.tzinfo is not None
+    assert DummyLayer.instances[-1].session is pipeline.http_session
+
+
+def test_pipeline_recreates_output_dir_removed_between_runs(tmp_path, monkeypatch):
+    output_root = tmp_path / "outputs"
+    monkeypatch.setenv("OUTPUT_ROOT", str(output_root))
+    monkeypatch.setenv("CACHE_PATH", str(tmp_path / "cache" / "http_cache.sqlite"))
+    get_settings.cache_clear()
+
+    config = SourceConfig(
+        {
+            "default_crs": 4326,
+            "map": {"width_px": 400, "height_px": 300, "dpi": 100},
+            "parcels": {"provider": "dummy", "id_field": "APN"},
+            "layers": {"overlay": {"type": "arcgis_feature", "target_epsg": 3857}},
+        }
+    )
+    pipeline = RenderPipeline(
+        geocode_service=DummyGeocodeService(),
+        config=config,
+        layer_registry={"arcgis_feature": DummyLayer},
+    )
+    request = RenderRequest(apn="987-654-321", layers=["overlay"], buffer_feet=100, output_dpi=100)
+
+    pipeline.run(request)
+    shutil.rmtree(output_root)
+    response = pipeline.run(request)
+
+    assert response.warnings == []
+    assert (output_root / "987-654-321" / "overlay.png").stat().st_size > 0
+
+
+class FailingLayer(DummyLayer):
+    """Layer adapter whose fetch always fails."""
+
+    def fetch(self, extent, **_):
+        raise RuntimeError("service unavailable")
+
+
+def test_pipeline_renders_placeholder_for_failed_layer(tmp_path, monkeypatch):
+    output_root = tmp_path / "outputs"
+    output_root.mkdir()
+    monkeypatch.setenv("OUTPUT_ROOT", str(output_root))
+    monkeypatch.setenv("CACHE_PATH", str(tmp_path / "cache" / "http_cache.sqlite"))
+    get_settings.cache_clear()
+
+    config = SourceConfig(
+        {
+            "default_crs": 4326,
+            "map": {"width_px": 400, "height_px": 300, "dpi": 100},
+            "parcels": {"provider": "dummy", "id_field": "APN"},
+            "layers": {
+                "overlay": {"type": "arcgis_feature", "target_epsg": 3857},
+                "broken": {"type": "wms", "target_epsg": 3857},
+            },
+        }
+    )
+    pipeline = RenderPipeline(
+        geocode_service=DummyGeocodeService(),
+        config=config,
+        layer_registry={"arcgis_feature": DummyLayer, "wms": FailingLayer},
+    )
+    request = RenderRequest(address="123 Main St", layers=["broken", "overlay"], buffer_feet=100, output_dpi=100)
+
+    response = pipeline.run(request)
+
+    assert list(response.images) == ["broken", "overlay"]
+    assert response.images["broken"].endswith("broken_error.png")
+    assert response.warnings == ["Layer 'broken' failed: service unavailable"]
+
+
+def test_pipeline_binds_arcgis_token_and_rejects_unregistered_types(tmp_path, monkeypatch):
+    output_root = tmp_path / "outputs"
+    output_root.mkdir()
+    monkeypatch.setenv("OUTPUT_ROOT", str(output_root))
+    monkeypatch.setenv("CACHE_PATH", str(tmp_path / "cache" / "http_cache.sqlite"))
+    monkeypatch.setenv("ARCGIS_TOKEN", "secret")
+    get_settings.cache_clear()
+
+    config = SourceConfig(
+        {
+            "default_crs": 4326,
+            "map": {"width_px": 400, "height_px": 300, "dpi": 100},
+            "parcels": {"provider": "dummy", "id_field": "APN"},
+            "layers": {
+                "overlay": {"type": "arcgis_feature", "target_epsg": 3857},
+                "tiles": {"type": "xyz", "target_epsg": 3857},
+            },
+        }
+    )
+    pipeline = RenderPipeline(
+        geocode_service=DummyGeocodeService(),
+        config=config,
+        layer_registry={"arcgis_feature": DummyLayer},
+    )
+
+    adapter = pipeline._build_layer_adapter(config.get_layer("overlay"))
+    response = pipeline.run(RenderRequest(apn="123-456-789", layers=["tiles"], buffer_feet=100, output_dpi=100))
+
+    assert adapter.kwargs["token"] == "secret"
+    assert adapter.session is pipeline.http_session
+    assert response.warnings == ["Layer 'tiles' failed: Layer type 'xyz' is not registered."]
+
+
+def test_pipelines_with_different_cache_paths_get_their_own_sessions(tmp_path, monkeypatch):
+    monkeypatch.setenv("OUTPUT_ROOT", str(tmp_path / "outputs"))
+    get_settings.cache_clear()
+
+    def build(name):
+        config = SourceConfig(
+            {
+                "parcels": {"provider": "dummy"},
+                "cache": {"path": str(tmp_path / name / "http_cache.sqlite")},
+                "layers": {},
+            }
+        )
+        return RenderPipeline(geocode_service=DummyGeocodeService(), config=config)
+
+    first, second, again = build("a"), build("b"), build("a")
+
+    assert first.http_session is not second.http_session
+    assert first.http_session is again.http_session
+    assert Path(second.http_session.cache.db_path).parent == tmp_path / "b"
+
+
+def test_run_async_renders_on_running_loop(tmp_path, monkeypatch):
+    output_root = tmp_path / "outputs"
+    output_root.mkdir()
+    monkeypatch.setenv("OUTPUT_ROOT", str(output_root))
+    monkeypatch.setenv("CACHE_PATH", str(tmp_path / "cache" / "http_cache.sqlite"))
+    get_settings.cache_clear()
+
+    config = SourceConfig(
+        {
+            "default_crs": 4326,
+            "map": {"width_px": 400, "height_px": 300, "dpi": 100},
+            "parcels": {"provider": "dummy", "id_field": "APN"},
+            "layers": {"overlay": {"type": "arcgis_feature", "target_epsg": 3857}},
+        }
+    )
+    pipeline = RenderPipeline(
+        geocode_service=DummyGeocodeService(),
+        config=config,
+        layer_registry={"arcgis_feature": DummyLayer},
+    )
+    requests = [
+        RenderRequest(apn=apn, layers=["overlay"], buffer_feet=100, output_dpi=100)
+        for apn in ("111-222-333", "444-555-666")
+    ]
+
+    async def render_concurrently():
+        return await asyncio.gather(*(pipeline.run_async(request) for request in requests))
+
+    responses = asyncio.run(render_concurrently())
+
+    assert [response.images for response in responses] == [
+        {"overlay": "/outputs/111-222-333/overlay.png"},
+        {"overlay": "/outputs/444-555-666/overlay.png"},
+    ]
+    assert (output_root / "444-555-666" / "overlay.png").stat().st_size > 0
+
+
+def test_warm_targets_pick_one_service_url_per_host():
+    configs = [
+        LayerConfig(name=name, type="wms", target_epsg=3857, params=params)
+        for name, params in [
+            ("zoning", {"url": "https://gis.example.com/arcgis/rest/services/Zoning/FeatureServer/0"}),
+            ("roads", {"url": "https://gis.example.com/arcgis/rest/services/Roads/FeatureServer/2"}),
+            ("flood", {"url": "https://hazards.example.gov/wms?service=WMS"}),
+            ("custom", {}),
+        ]
+    ]
+
+    assert _warm_targets(configs) == [
+        "https://gis.example.com/arcgis/rest/services/Zoning/FeatureServer/0",
+        "https://hazards.example.gov/wms?service=WMS",
+    ]
+
+
+def test_slow_warm_up_does_not_delay_layer_fetches(tmp_path, monkeypatch):
+    output_root = tmp_path / "outputs"
+    output_root.mkdir()
+    monkeypatch.setenv("OUTPUT_ROOT", str(output_root))
+    monkeypatch.setenv("CACHE_PATH", str(tmp_path / "cache" / "http_cache.sqlite"))
+    get_settings.cache_clear()
+
+    url = "https://gis.example.com/arcgis/rest/services/Zoning/FeatureServer/0"
+    config = SourceConfig(
+        {
+            "default_crs": 4326,
+            "map": {"width_px": 400, "height_px": 300, "dpi": 100},
+            "parcels": {"provider": "dummy", "id_field": "APN"},
+            "layers": {
+                "zoning": {"type": "arcgis_feature", "target_epsg": 3857, "url": url, "object_id_field": "OBJECTID"}
+            },
+        }
+    )
+    pipeline = RenderPipeline(
+        geocode_service=DummyGeocodeService(),
+        config=config,
+        layer_registry={"arcgis_feature": ArcGISFeatureLayer},
+    )
+
+    async def slow_head(request):
+        await asyncio.sleep(3)
+        return httpx.Response(200)
+
+    with respx.mock:
+        respx.head(url).mock(side_effect=slow_head)
+        respx.get(f"{url}/query").mock(return_value=httpx.Response(200, json={"features": []}))
+        started = time.perf_counter()
+        response = pipeline.run(RenderRequest(apn="123-456-789", layers=["zoning"], buffer_feet=100, output_dpi=100))
+        elapsed = time.perf_counter() - started
+
+    assert response.warnings == ["No features returned for extent."]
+    assert elapsed < 2
+
+
+def test_run_async_reuses_a_caller_supplied_client_across_renders(tmp_path, monkeypatch):
+    monkeypatch.setenv("OUTPUT_ROOT", str(tmp_path / "outputs"))
+    monkeypatch.setenv("CACHE_PATH", str(tmp_path / "cache" / "http_cache.sqlite"))
+    get_settings.cache_clear()
+
+    url = "https://gis.example.com/arcgis/rest/services/Zoning/FeatureServer/0"
+    config = SourceConfig(
+        {
+            "default_crs": 4326,
+            "map": {"width_px": 400, "height_px": 300, "dpi": 100},
+            "parcels": {"provider": "dummy", "id_field": "APN"},
+            "cache": {"layer_cache_mb": 0},
+            "layers": {
+                "zoning": {"type": "arcgis_feature", "target_epsg": 3857, "url": url, "object_id_field": "OBJECTID"}
+            },
+        }
+    )
+    pipeline = RenderPipeline(
+        geocode_service=DummyGeocodeService(),
+        config=config,
+        layer_registry={"arcgis_feature": ArcGISFeatureLayer},
+    )
+    sent = []
+
+    async def record(request):
+        sent.append(request.method)
+
+    async def render_twice():
+        async with httpx.AsyncClient(event_hooks={"request": [record]}) as client:
+            for apn in ("111-222-333", "444-555-666"):
+                await pipeline.run_async(
+                    RenderRequest(apn=apn, layers=["zoning"], buffer_feet=100, output_dpi=100), client=client
+                )
+            return client.is_closed
+
+    with respx.mock:
+        respx.head(url).mock(return_value=httpx.Response(200))
+        respx.get(f"{url}/query").mock(return_value=httpx.Response(200, json={"features": []}))
+        closed = asyncio.run(render_twice())
+
+    assert not closed
+    assert sent.count("GET") == 2
+
+
+def test_close_shuts_down_render_workers_and_response_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("OUTPUT_ROOT", str(tmp_path / "outputs"))
+    get_settings.cache_clear()
+    config = SourceConfig(
+        {"parcels": {"provider": "dummy"}, "cache": {"path": str(tmp_path / "http_cache.sqlite")}, "layers": {}}
+    )
+    pipeline = RenderPipeline(geocode_service=DummyGeocodeService(), config=config)
+
+    pipeline.close()
+
+    with pytest.raises(RuntimeError):
+        pipeline._render_executor.submit(print)
+    with pytest.raises(sqlite3.ProgrammingError):
+        pipeline.response_cache.get("missing")
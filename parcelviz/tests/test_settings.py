@@ -0,0 +1,35 @@
+"""Tests for environment-driven settings."""
+
+from pathlib import Path
+
+import pytest
+
+from parcelviz.settings import AppSettings
+
+
+def test_from_env_coerces_values(tmp_path):
+    settings = AppSettings.from_env(
+        {"OUTPUT_ROOT": "/srv/outputs", "api_port": "9001", "API_RELOAD": "yes", "RENDER_WORKERS": "4"},
+        env_file=tmp_path / ".env",
+    )
+
+    assert settings.output_root == Path("/srv/outputs")
+    assert settings.api_port == 9001
+    assert settings.api_reload is True
+    assert settings.render_workers == 4
+    assert settings.cache_path == Path("cache/http_cache.sqlite")
+
+
+def test_from_env_prefers_environment_over_env_file(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("LIGHTBOX_API_KEY=from-file\nLOG_LEVEL=DEBUG\n", encoding="utf-8")
+
+    settings = AppSettings.from_env({"LIGHTBOX_API_KEY": "from-env"}, env_file=env_file)
+
+    assert settings.lightbox_api_key == "from-env"
+    assert settings.log_level == "DEBUG"
+
+
+def test_from_env_rejects_invalid_values(tmp_path):
+    with pytest.raises(ValueError, match="api_port"):
+        AppSettings.from_env({"API_PORT": "eighty"}, env_file=tmp_path / ".env")
@@ -0,0 +1,46 @@
+"""Tests for helper utilities."""
+
+import shutil
+from pathlib import Path
+
+from parcelviz.utils import ensure_directory, extent_hash, retry_missing_directory
+
+
+def test_extent_hash_is_stable_and_order_independent():
+    bbox = {"xmin": 1.0, "ymin": 2.0, "xmax": 3.0, "ymax": 4.0}
+    reordered = {"ymax": 4.0, "xmax": 3.0, "ymin": 2.0, "xmin": 1.0}
+
+    assert extent_hash(bbox) == extent_hash(reordered)
+    assert extent_hash(bbox) == extent_hash({"xmin": 1, "ymin": 2, "xmax": 3, "ymax": 4})
+    assert len(extent_hash(bbox)) == 32
+
+
+def test_extent_hash_distinguishes_extents():
+    bbox = {"xmin": 1.0, "ymin": 2.0, "xmax": 3.0, "ymax": 4.0}
+
+    assert extent_hash(bbox) != extent_hash({**bbox, "ymax": 4.5})
+    assert extent_hash(bbox) != extent_hash({**bbox, "layer": "flood"})
+    assert extent_hash({**bbox, "layer": "flood"}) == extent_hash({"layer": "flood", **bbox})
+
+
+def test_ensure_directory_skips_mkdir_for_known_directories(tmp_path, monkeypatch):
+    target = tmp_path / "outputs" / "123-456"
+
+    assert ensure_directory(target) == target
+    assert target.is_dir()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("mkdir called for a known directory")
+
+    monkeypatch.setattr(Path, "mkdir", fail)
+    assert ensure_directory(target) == target
+
+
+def test_retry_missing_directory_recreates_a_deleted_known_directory(tmp_path):
+    target = ensure_directory(tmp_path / "outputs" / "123-456")
+    shutil.rmtree(target)
+
+    written = retry_missing_directory(target, lambda: (target / "layer.png").write_bytes(b"png"))
+
+    assert written == 3
+    assert (target / "layer.png").read_bytes() == b"png"